@@ -7,3 +7,9 @@ class LittlelemonapiConfig(AppConfig):
 
     def ready(self) -> None:
         import little_lemon.utils.cache  # noqa
+        import LittleLemonAPI.views  # noqa
+        from little_lemon.utils.cache import build_cache_dependency_registry
+        from LittleLemonAPI.views import menu_typeahead_index
+
+        menu_typeahead_index.connect()
+        build_cache_dependency_registry()
@@ -0,0 +1,91 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.filters import SearchFilter
+
+from little_lemon.utils.search import FullTextSearchFilter
+from LittleLemonAPI.models import Category, MenuItem
+from LittleLemonAPI.views import MenuItemsListView
+
+WORDS = (
+    "lemon grilled salmon pizza margherita greek salad bruschetta dessert chocolate cake "
+    "lamb souvlaki feta olive pasta chicken spinach pie hummus falafel baklava risotto"
+).split()
+
+# Exact words, a stemmed plural, a typo and a substring
+TERMS = ("grilled salmon", "baklava", "pizzas", "margarita", "uvlak")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of the menu full-text search and DRF's ILIKE search filter "
+        "on a generated table. Postgres only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=100000,
+            help="Number of menu items in the generated table.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of runs per term and filter, the fastest one is reported.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The full-text search only runs on Postgres")
+
+        # The items are only needed for the benchmark, so they are rolled back afterwards
+        with transaction.atomic():
+            category = Category.objects.create(
+                title="Benchmark", slug=f"benchmark-{time.time_ns()}"
+            )
+            rng = random.Random(0)
+            MenuItem.objects.bulk_create(
+                (
+                    MenuItem(
+                        title=" ".join(rng.sample(WORDS, 3)).title(),
+                        price=index % 100 + 0.99,
+                        category=category,
+                    )
+                    for index in range(options["items"])
+                ),
+                batch_size=5000,
+            )
+            # Fresh statistics, so the planner knows the GIN indexes are worth using
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {MenuItem._meta.db_table}")
+
+            view = MenuItemsListView()
+            queryset = MenuItem.objects.filter(category=category)
+            page_size = 25
+            lookup = SearchFilter().construct_search("title", queryset)
+            for term in TERMS:
+                terms = term.split()
+                # What SearchFilter builds, one ILIKE '%term%' per term
+                baseline = queryset
+                for word in terms:
+                    baseline = baseline.filter(**{lookup: word})
+                search = FullTextSearchFilter().search(queryset, terms, view)
+                self.report(term, "ilike", baseline, page_size, options["repeat"])
+                self.report(term, "search", search, page_size, options["repeat"])
+            transaction.set_rollback(True)
+
+    def report(self, term: str, name: str, queryset, page_size: int, repeat: int):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count = queryset.count()
+            page = list(queryset.values_list("pk", flat=True)[:page_size])
+            best = min(best, time.perf_counter() - started)
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(f"{term!r:18} {name:7}")
+            + f"  {best * 1000:8.1f}ms  matches={count:,}  page={len(page)}"
+        )
@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from LittleLemonAPI.models import Category, MenuItem
+from LittleLemonAPI.serializers import (MenuItemDetailSerializer,
+                                        MenuItemSerializer)
+
+
+class Command(BaseCommand):
+    help = "Compare the items/sec of the DRF menu serializers and their .values() fast paths."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=10000,
+            help="Number of menu items serialized per run.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of runs per serializer, the fastest one is reported.",
+        )
+
+    def handle(self, *args, **options):
+        # The items are only needed for the benchmark, so they are rolled back afterwards
+        with transaction.atomic():
+            category = Category.objects.create(
+                title="Benchmark", slug=f"benchmark-{time.time_ns()}"
+            )
+            MenuItem.objects.bulk_create(
+                (
+                    MenuItem(
+                        title=f"Benchmark item {index}",
+                        price=index % 100 + 0.99,
+                        category=category,
+                        calories=index % 900,
+                        sugar_gm=index % 40,
+                        contains_dairy=bool(index % 2),
+                    )
+                    for index in range(options["items"])
+                ),
+                batch_size=1000,
+            )
+            queryset = MenuItem.objects.filter(category=category).select_related(
+                "category"
+            )
+            for serializer_class in (MenuItemSerializer, MenuItemDetailSerializer):
+                self.report(serializer_class, queryset, options["repeat"])
+            transaction.set_rollback(True)
+
+    def report(self, serializer_class, queryset, repeat: int) -> None:
+        drf = self.best_rate(
+            lambda: serializer_class(queryset.all(), many=True).data, repeat
+        )
+        fast = self.best_rate(
+            lambda: [
+                serializer_class.represent_values(row)
+                for row in queryset.values(*serializer_class.values_fields)
+            ],
+            repeat,
+        )
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(serializer_class.__name__)
+            + f"  drf={drf:,.0f} items/s  values={fast:,.0f} items/s"
+            + f"  speedup={fast / drf:.1f}x"
+        )
+
+    def best_rate(self, serialize, repeat: int) -> float:
+        best = 0.0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count = len(serialize())
+            best = max(best, count / (time.perf_counter() - started))
+        return best
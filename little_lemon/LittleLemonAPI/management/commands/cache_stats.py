@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from little_lemon.utils.cache import cached_view_namespaces
+from little_lemon.utils.cache_stats import collect_namespace_stats
+
+
+class Command(BaseCommand):
+    help = "Report the Redis keys, memory, hit ratio and hottest keys of each cached view namespace."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Number of hot keys reported per namespace, at most VIEW_CACHE_STATS_MAX_TOP.",
+        )
+
+    def handle(self, *args, **options):
+        if options["top"] < 1:
+            raise CommandError("--top must be a positive integer")
+        for report in collect_namespace_stats(
+            cached_view_namespaces(), top_n=options["top"]
+        ):
+            hit_ratio = report["hit_ratio"]
+            hit_ratio = "n/a" if hit_ratio is None else f"{hit_ratio:.1%}"
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(report["namespace"])
+                + f"  keys={report['keys']} bytes={report['bytes']}"
+                + f" hit_ratio={hit_ratio} reads~{report['estimated_reads']}"
+            )
+            for hot_key in report["hot_keys"]:
+                self.stdout.write(
+                    f"  {hot_key['estimated_reads']:>8}  {hot_key['key']}"
+                )
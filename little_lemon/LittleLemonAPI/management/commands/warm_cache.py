@@ -0,0 +1,169 @@
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import BooleanField
+from django.urls import reverse
+from loguru import logger
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from LittleLemonAPI.models import MenuItem
+from LittleLemonAPI.views import MenuItemDetailView, MenuItemsListView
+
+
+class Command(BaseCommand):
+    help = "Populate the view cache with the popular menu list queries and every menu item."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=3,
+            help="Number of list pages to warm for each filter combination.",
+        )
+        parser.add_argument(
+            "--max-filters",
+            type=int,
+            default=1,
+            help="Largest number of filters combined in one list query.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Number of requests sent at the same time.",
+        )
+        parser.add_argument(
+            "--base-url",
+            default=settings.VIEW_CACHE_WARM_BASE_URL,
+            help=(
+                "Public URL of the API, e.g. https://api.example.com. List pages embed "
+                "absolute next/previous links built from it, so they are only warmed "
+                "when it is set. Defaults to the CACHE_WARM_BASE_URL setting."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        # The requests go through the views themselves, so they populate exactly the keys
+        # CachedResponseMixin builds for real clients. Throttling is meant for clients only.
+        list_view = MenuItemsListView.as_view(throttle_classes=[])
+        detail_view = MenuItemDetailView.as_view(throttle_classes=[])
+        base_url = options["base_url"]
+        # Public list entries are served to every client with their links, so the requests
+        # must carry the API's public host instead of the factory's "testserver"
+        parts = urlsplit(base_url)
+        if base_url and (parts.scheme not in ("http", "https") or not parts.netloc):
+            raise CommandError(f"Invalid base URL {base_url!r}")
+        secure = parts.scheme == "https"
+        host = {"HTTP_HOST": parts.netloc} if base_url else {}
+        # Warm the JSON representation API clients negotiate
+        factory = APIRequestFactory(HTTP_ACCEPT="application/json", **host)
+
+        jobs = []
+        if base_url:
+            jobs.extend(
+                (
+                    list_view,
+                    factory.get(reverse("items-list"), params, secure=secure),
+                    {},
+                )
+                for params in self.list_query_params(
+                    options["pages"], options["max_filters"]
+                )
+            )
+        else:
+            logger.warning(
+                "Not warming menu list pages, set CACHE_WARM_BASE_URL or --base-url "
+                "so their links point at the API"
+            )
+        jobs.extend(
+            (
+                detail_view,
+                factory.get(reverse("items-detail", args=[pk]), secure=secure),
+                {"item_id": pk},
+            )
+            for pk in MenuItem.objects.values_list("pk", flat=True)
+        )
+
+        warmed = failed = 0
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            futures = [executor.submit(self.warm, *job) for job in jobs]
+            for future in as_completed(futures):
+                if future.result():
+                    warmed += 1
+                else:
+                    failed += 1
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Cache warmed: {warmed} responses, {failed} failed in {elapsed:.2f}s"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {warmed} responses ({failed} failed) in {elapsed:.2f}s"
+            )
+        )
+
+    def list_query_params(self, pages: int, max_filters: int) -> list[dict]:
+        """Return the query parameters of every list request to warm.
+
+        Each combination of up to `max_filters` of the view's `filterset_fields` is paired with
+        every value of those filters and with the first `pages` pages.
+
+        Args:
+            pages (int): Number of pages to warm per filter combination.
+            max_filters (int): Largest number of filters combined in one query.
+
+        Returns:
+            list[dict]: The query parameters of each request.
+        """
+        filter_values = {}
+        for name in MenuItemsListView.filterset_fields:
+            field = MenuItem._meta.get_field(name)
+            if field.is_relation:
+                values = field.related_model.objects.values_list("pk", flat=True)
+                filter_values[name] = [str(value) for value in values]
+            elif isinstance(field, BooleanField):
+                filter_values[name] = ["true", "false"]
+            else:
+                logger.warning(
+                    f"Not warming the {name} filter, its values are unbounded"
+                )
+
+        limit = api_settings.PAGE_SIZE
+        query_params = []
+        for size in range(min(max_filters, len(filter_values)) + 1):
+            for names in itertools.combinations(filter_values, size):
+                for values in itertools.product(*(filter_values[n] for n in names)):
+                    for page in range(pages):
+                        params = dict(zip(names, values))
+                        params.update(limit=limit, offset=page * limit)
+                        query_params.append(params)
+        return query_params
+
+    def warm(self, view, request, kwargs: dict) -> bool:
+        """Send one request through a view and report whether it produced a response to cache.
+
+        Args:
+            view: The view function returned by `as_view`.
+            request: The request to send.
+            kwargs (dict): The URL keyword arguments of the request.
+
+        Returns:
+            bool: True if the view answered with a 200.
+        """
+        try:
+            response = view(request, **kwargs)
+            return response.status_code == 200
+        except Exception as e:
+            logger.error(f"Unable to warm {request.get_full_path()}: {e}")
+            return False
+        finally:
+            # Each worker thread opened its own connection
+            connection.close()
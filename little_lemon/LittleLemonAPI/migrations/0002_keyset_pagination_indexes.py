@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-17 09:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LittleLemonAPI", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="menuitem",
+            index=models.Index(
+                fields=["category", "title", "item_id"], name="menu_items_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["date", "id"], name="orders_keyset_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["user", "date", "id"], name="orders_user_keyset_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.2 on 2026-10-17 09:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LittleLemonAPI", "0002_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        # gin_trgm_ops and the % operator come from pg_trgm
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="menuitem",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "title", config="english"
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="menuitem",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="menu_items_search_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="menuitem",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass("title", name="gin_trgm_ops"),
+                name="menu_items_title_trgm_idx",
+            ),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django_prometheus.models import ExportModelOperationsMixin
 
@@ -42,6 +44,12 @@ class MenuItem(ExportModelOperationsMixin("menu_items"), models.Model):
     contains_treenuts = models.BooleanField(null=True, blank=True)
     contains_gluten = models.BooleanField(null=True, blank=True)
     is_on_sale = models.BooleanField(null=True, blank=True)
+    # Kept up to date by Postgres, and indexed for the menu search
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", config="english"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     def __str__(self):
         return f"{self.title} ({self.category.title})"
@@ -49,6 +57,15 @@ class MenuItem(ExportModelOperationsMixin("menu_items"), models.Model):
     class Meta:
         db_table = "menu_items"
         ordering = ["category", "title"]
+        indexes = [
+            models.Index(
+                fields=["category", "title", "item_id"], name="menu_items_keyset_idx"
+            ),
+            GinIndex(fields=["search_vector"], name="menu_items_search_idx"),
+            GinIndex(
+                OpClass("title", name="gin_trgm_ops"), name="menu_items_title_trgm_idx"
+            ),
+        ]
         verbose_name = "menu item"
         verbose_name_plural = "menu items"
 
@@ -93,6 +110,10 @@ class Order(ExportModelOperationsMixin("orders"), models.Model):
     class Meta:
         db_table = "orders"
         ordering = ["user", "date", "status"]
+        indexes = [
+            models.Index(fields=["date", "id"], name="orders_keyset_idx"),
+            models.Index(fields=["user", "date", "id"], name="orders_user_keyset_idx"),
+        ]
         verbose_name = "order"
         verbose_name_plural = "orders"
 
@@ -1,22 +1,26 @@
 import json
 from datetime import datetime
+from typing import Optional
 
 from django.contrib.auth.models import Group, User
 from django.forms.models import model_to_dict
 from drf_spectacular.utils import OpenApiExample, extend_schema_serializer
 from loguru import logger
-from rest_framework.serializers import (CharField, HiddenField,
+from rest_framework.serializers import (CharField, DecimalField, HiddenField,
                                         ModelSerializer,
                                         PrimaryKeyRelatedField, ReadOnlyField,
                                         SerializerMethodField)
 
 from LittleLemonAPI.models import Cart, Category, MenuItem, Order
 
+# Formats the menu's decimal columns like the model serializers do
+menu_decimal_field = DecimalField(max_digits=6, decimal_places=2)
+
 
 class PriceRounder:
 
     def round_price(self, instance):
-        logger.debug(f"Rounding price for {instance}")
+        logger.opt(lazy=True).debug("Rounding price for {}", lambda: instance)
         return round(instance.price, 2)
 
     def calculate_price(self, quantity, unit_price):
@@ -78,16 +82,77 @@ class MenuItemDetailSerializer(PriceRounder, ModelSerializer):
     item_id = ReadOnlyField()
     category = PrimaryKeyRelatedField(queryset=Category.objects.all())
 
+    # Read-only fast path, see `represent_values`
+    values_fields = (
+        "item_id",
+        "title",
+        "price",
+        "featured",
+        "is_on_sale",
+        "category__title",
+        "calories",
+        "sugar_gm",
+        "protein_gm",
+        "carbohydrates_mg",
+        "saturated_fat_gm",
+        "contains_dairy",
+        "contains_gluten",
+        "contains_treenuts",
+    )
+
     class Meta:
         model = MenuItem
-        fields = "__all__"
+        exclude = ["search_vector"]
+
+    @classmethod
+    def represent_values(cls, row: dict) -> dict:
+        """Build the public representation of a menu item straight from a `.values()` row.
+
+        The output is identical to `to_representation`, without building the DRF
+        representation first and reshaping it.
+
+        Args:
+            row (dict): A row of `MenuItem.objects.values(*values_fields)`.
+
+        Returns:
+            dict: The menu item's representation.
+        """
+        decimal = menu_decimal_field.to_representation
+
+        def grams(value) -> Optional[str]:
+            return None if value is None else decimal(value)
+
+        return {
+            "product_sku": row["item_id"],
+            "category": row["category__title"],
+            "product_name": row["title"],
+            "price_per_item": decimal(row["price"]),
+            "featured": row["featured"],
+            "on_sale": row["is_on_sale"],
+            "nutritional_facts": {
+                "calories": row["calories"],
+                "sugar": f"{grams(row['sugar_gm'])} gram(s)",
+                "protein": f"{grams(row['protein_gm'])} gram(s)",
+                "carbohydrates": f"{grams(row['carbohydrates_mg'])} milligram(s)",
+                "saturated_fat": f"{grams(row['saturated_fat_gm'])} gram(s)",
+            },
+            "allergens": {
+                "contains_dairy": row["contains_dairy"],
+                "contains_gluten": row["contains_gluten"],
+                "contains_treenuts": row["contains_treenuts"],
+            },
+        }
 
     def to_representation(self, instance):
-        logger.info(f"Serializing menu item {instance}")
+        logger.opt(lazy=True).info("Serializing menu item {}", lambda: instance)
         representation = super().to_representation(instance)
-        logger.debug(f"Serialized menu item {instance} to {representation}")
+        logger.opt(lazy=True).debug(
+            "Serialized menu item {} to {}", lambda: instance, lambda: representation
+        )
         representation["category"] = instance.category.title
-        logger.debug(f"Modified menu item representation to {representation}")
+        logger.opt(lazy=True).debug(
+            "Modified menu item representation to {}", lambda: representation
+        )
         return {
             "product_sku": representation["item_id"],
             "category": representation["category"],
@@ -119,16 +184,43 @@ class MenuItemSerializer(PriceRounder, ModelSerializer):
     item_id = ReadOnlyField()
     category = PrimaryKeyRelatedField(queryset=Category.objects.all())
 
+    # Read-only fast path, see `represent_values`
+    values_fields = ("item_id", "title", "price", "category__title")
+
     class Meta:
         model = MenuItem
         fields = ["item_id", "title", "price", "category"]
 
+    @classmethod
+    def represent_values(cls, row: dict) -> dict:
+        """Build the public representation of a menu item straight from a `.values()` row.
+
+        The output is identical to `to_representation`, without building the DRF
+        representation first and reshaping it.
+
+        Args:
+            row (dict): A row of `MenuItem.objects.values(*values_fields)`.
+
+        Returns:
+            dict: The menu item's representation.
+        """
+        return {
+            "product_sku": int(row["item_id"]),
+            "category": row["category__title"],
+            "product_name": row["title"],
+            "price_per_item": float(row["price"]),
+        }
+
     def to_representation(self, instance):
-        logger.info(f"Serializing menu item {instance}")
+        logger.opt(lazy=True).info("Serializing menu item {}", lambda: instance)
         representation = super().to_representation(instance)
-        logger.debug(f"Serialized menu item {instance} to {representation}")
+        logger.opt(lazy=True).debug(
+            "Serialized menu item {} to {}", lambda: instance, lambda: representation
+        )
         representation["category"] = instance.category.title
-        logger.debug(f"Modified menu item representation to {representation}")
+        logger.opt(lazy=True).debug(
+            "Modified menu item representation to {}", lambda: representation
+        )
         return {
             "product_sku": int(representation["item_id"]),
             "category": representation["category"],
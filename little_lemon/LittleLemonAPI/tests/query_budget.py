@@ -0,0 +1,37 @@
+from typing import Callable, Iterable
+
+from cachalot.api import cachalot_disabled
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from little_lemon.utils.cache import local_cache
+
+
+class QueryBudgetMixin:
+    """Assertions on the number of queries a cached view runs on a cache miss."""
+
+    def assertQueryBudget(
+        self, request: Callable[[int], object], sizes: Iterable[int], budget: int
+    ) -> None:
+        """Assert that `request(size)` runs at most `budget` queries, whatever the size.
+
+        The cache is cleared and cachalot disabled for each request, so every request is a
+        miss that reaches the database. The assertion fails when the query count changes
+        with the size, i.e. on N+1 queries, even if every count is within the budget.
+
+        Args:
+            request (Callable): Sends the request for a given page size.
+            sizes (Iterable[int]): The page sizes to try.
+            budget (int): The maximum number of queries allowed.
+        """
+        counts = {}
+        for size in sizes:
+            cache.clear()
+            local_cache.clear()
+            with cachalot_disabled(), CaptureQueriesContext(connection) as queries:
+                request(size)
+            counts[size] = len(queries)
+        details = f"Queries per page size: {counts}"
+        self.assertLessEqual(max(counts.values()), budget, details)
+        self.assertEqual(len(set(counts.values())), 1, details)
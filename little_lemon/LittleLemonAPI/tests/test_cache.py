@@ -1,45 +1,60 @@
 # tests.py
 import hashlib
+import json
+import time
+from unittest.mock import patch
 
 from django.contrib.auth.models import Group, User
 from django.core.cache import cache
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
-from rest_framework.test import APIClient
+from rest_framework.authtoken.models import Token
+from rest_framework.test import (APIClient, APIRequestFactory,
+                                 force_authenticate)
 
+from little_lemon.utils.cache import (get_namespace_generation,
+                                      handle_invalidation_message, local_cache)
+from little_lemon.utils.cache_budget import budget_index_keys
 from LittleLemonAPI.models import Cart, Category, MenuItem, Order
 from LittleLemonAPI.serializers import MenuItemSerializer
+from LittleLemonAPI.views import (MenuItemDetailView, MenuItemsListView,
+                                  OrderManagement)
 
 
 class CachingMechanismTestCase(TestCase):
     def setUp(self):
         # Clear the cache before each test
         cache.clear()
-
-        # Create test users
-        self.user = User.objects.create_user(username="testuser", password="testpass")
-        self.manager = User.objects.create_user(
-            username="manager", password="managerpass"
-        )
-        manager_group, created = Group.objects.get_or_create(name="manager")
-        self.manager.groups.add(manager_group)
-        self.test_category = Category.objects.create(
-            title="TEST", slug="test", category_id=1
-        )
-        # Create test menu items
-        self.menu_item1 = MenuItem.objects.create(
-            title="Pizza", price=10.00, category=self.test_category, featured=False
-        )
-        self.menu_item2 = MenuItem.objects.create(
-            title="Burger", price=8.00, category=self.test_category, featured=False
-        )
-
-        # Set up API clients
-        self.client = APIClient()
-        self.client.login(username="testuser", password="testpass")
-
-        self.manager_client = APIClient()
-        self.manager_client.login(username="manager", password="managerpass")
+        local_cache.clear()
+
+        # Flush the invalidations queued by the fixtures as if they had been committed
+        with self.captureOnCommitCallbacks(execute=True):
+            # Create test users
+            self.user = User.objects.create_user(
+                username="testuser", password="testpass"
+            )
+            self.manager = User.objects.create_user(
+                username="manager", password="managerpass"
+            )
+            manager_group, created = Group.objects.get_or_create(name="manager")
+            self.manager.groups.add(manager_group)
+            self.test_category = Category.objects.create(
+                title="TEST", slug="test", category_id=1
+            )
+            # Create test menu items
+            self.menu_item1 = MenuItem.objects.create(
+                title="Pizza", price=10.00, category=self.test_category, featured=False
+            )
+            self.menu_item2 = MenuItem.objects.create(
+                title="Burger", price=8.00, category=self.test_category, featured=False
+            )
+
+            # Set up API clients
+            self.client = APIClient()
+            self.client.login(username="testuser", password="testpass")
+
+            self.manager_client = APIClient()
+            self.manager_client.login(username="manager", password="managerpass")
 
         # Endpoint URL
         self.menu_items_url = reverse("items-list")
@@ -56,13 +71,16 @@ class CachingMechanismTestCase(TestCase):
         )
         return (new_item1, new_item2, new_item3)
 
-    def get_cache_key(self, user, query_params=""):
-        user_id = user.id if user.is_authenticated else "anon"
+    def get_titles(self, response):
+        return [item["product_name"] for item in response.json()["results"]]
+
+    def get_cache_key(self, user, query_params="limit=25&offset=0"):
+        # The menu is cached publicly, so the key does not depend on the user
         query_params_hash = hashlib.md5(query_params.encode("utf-8")).hexdigest()
-        model_names = "MenuItem"  # Since cache_models = [MenuItem] in the view
-        return (
-            f"MenuItemsListView_{model_names}_{user_id}_{query_params_hash}_cache_key"
-        )
+        model_names = "MenuItem_Category_json"  # models + renderer format
+        namespace = "MenuItem:MenuItemsListView"
+        generation = get_namespace_generation(namespace)
+        return f"{{{namespace}}}:g{generation}:{model_names}_public_{query_params_hash}_cache_key"
 
     def test_data_is_cached(self):
         # Make a GET request to the menu items list view
@@ -75,8 +93,8 @@ class CachingMechanismTestCase(TestCase):
         # Check that data is cached
         cached_data = cache.get(cache_key)
         self.assertIsNotNone(cached_data)
-        # Ensure that the cached data matches the response data
-        self.assertEqual(cached_data, response.data)
+        # Ensure that the cached body matches the response
+        self.assertEqual(cached_data["body"], response.content)
 
     def test_cached_data_is_served(self):
         # Make the first request to cache the data
@@ -89,16 +107,15 @@ class CachingMechanismTestCase(TestCase):
         response = self.client.get(self.menu_items_url)
 
         # The response should still have the data from the cache
-        self.assertEqual(len(response.data), 2)
-        self.assertEqual(response.data[0]["title"], "Pizza")
-        self.assertEqual(response.data[1]["title"], "Burger")
+        self.assertEqual(self.get_titles(response), ["Burger", "Pizza"])
 
     def test_cache_invalidation_on_create(self):
         # Cache the data
         self.client.get(self.menu_items_url)
 
         # Add a new menu item
-        self.menu_item3, self.menu_item4, self.menu_item5 = self.seed_database()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item3, self.menu_item4, self.menu_item5 = self.seed_database()
         # Generate the cache key
         cache_key = self.get_cache_key(self.user)
 
@@ -110,8 +127,10 @@ class CachingMechanismTestCase(TestCase):
         response = self.client.get(self.menu_items_url)
 
         # The new item should be in the response
-        self.assertEqual(len(response.data), 3)
-        self.assertEqual(response.data[2]["title"], "Salad")
+        titles = self.get_titles(response)
+        self.assertEqual(len(titles), 5)
+        for item in (self.menu_item3, self.menu_item4, self.menu_item5):
+            self.assertIn(item.title, titles)
 
     def test_cache_invalidation_on_update(self):
         # Cache the data
@@ -119,7 +138,8 @@ class CachingMechanismTestCase(TestCase):
 
         # Update a menu item
         self.menu_item1.title = "Updated Pizza"
-        self.menu_item1.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.save()
 
         # Generate the cache key
         cache_key = self.get_cache_key(self.user)
@@ -132,14 +152,15 @@ class CachingMechanismTestCase(TestCase):
         response = self.client.get(self.menu_items_url)
 
         # The updated item should be in the response
-        self.assertEqual(response.data[0]["title"], "Updated Pizza")
+        self.assertIn("Updated Pizza", self.get_titles(response))
 
     def test_cache_invalidation_on_delete(self):
         # Cache the data
         self.client.get(self.menu_items_url)
 
         # Delete a menu item
-        self.menu_item1.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.delete()
 
         # Generate the cache key
         cache_key = self.get_cache_key(self.user)
@@ -152,56 +173,487 @@ class CachingMechanismTestCase(TestCase):
         response = self.client.get(self.menu_items_url)
 
         # The deleted item should not be in the response
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["title"], "Burger")
+        self.assertEqual(self.get_titles(response), ["Burger"])
 
-    def test_fresh_data_after_invalidation(self):
+    def test_invalidation_bumps_namespace_generation(self):
         # Cache the data
+        self.client.force_authenticate(user=self.user)
         self.client.get(self.menu_items_url)
+        stale_cache_key = self.get_cache_key(self.user)
+        generation = get_namespace_generation("MenuItem:MenuItemsListView")
 
         # Update a menu item
-        self.menu_item1.title = "Fresh Pizza"
-        self.menu_item1.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.save()
 
-        # Make a new request
-        response = self.client.get(self.menu_items_url)
+        # The namespace moves to a new generation instead of deleting keys
+        self.assertEqual(
+            get_namespace_generation("MenuItem:MenuItemsListView"), generation + 1
+        )
+        self.assertNotEqual(self.get_cache_key(self.user), stale_cache_key)
+        self.assertIsNotNone(cache.get(stale_cache_key))
+
+    def test_invalidation_follows_view_dependencies(self):
+        namespaces = [
+            "MenuItem:MenuItemsListView",
+            "Cart:CartManagement",
+            "Order:OrderManagement",
+        ]
+        generations = {ns: get_namespace_generation(ns) for ns in namespaces}
+
+        # Cart and Order views declare MenuItem in their cache_models
+        self.menu_item1.price = 11.00
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.save()
+        for namespace in namespaces:
+            self.assertEqual(
+                get_namespace_generation(namespace), generations[namespace] + 1
+            )
+
+        # A Category change only reaches the views that depend on Category
+        self.test_category.title = "RENAMED"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.test_category.save()
+        self.assertEqual(
+            get_namespace_generation("MenuItem:MenuItemsListView"),
+            generations["MenuItem:MenuItemsListView"] + 2,
+        )
+        self.assertEqual(
+            get_namespace_generation("Order:OrderManagement"),
+            generations["Order:OrderManagement"] + 1,
+        )
 
-        # The response should have fresh data
-        self.assertEqual(response.data[0]["title"], "Fresh Pizza")
+    def test_invalidation_is_batched_until_commit(self):
+        namespace = "MenuItem:MenuItemsListView"
+        generation = get_namespace_generation(namespace)
 
-    def test_cache_key_includes_user_specific_data(self):
-        # Make a request as an anonymous user
+        # Several writes in one transaction queue a single invalidation
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.menu_item1.save()
+            self.menu_item2.save()
+            self.test_category.save()
+            self.assertEqual(get_namespace_generation(namespace), generation)
+        self.assertEqual(len(callbacks), 1)
+
+        callbacks[0]()
+        self.assertEqual(get_namespace_generation(namespace), generation + 1)
+
+    def test_unregistered_models_do_not_invalidate(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Token.objects.create(user=self.user)
+        self.assertEqual(callbacks, [])
+
+    def test_stale_entry_served_while_another_worker_rebuilds(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.menu_items_url)
+
+        self.menu_item1.title = "Rebuilt Pizza"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.save()
+
+        # Simulate another worker holding the rebuild lock for the new key
+        lock = cache.lock(f"{self.get_cache_key(self.user)}:lock", timeout=10)
+        self.assertTrue(lock.acquire(blocking=False))
+        try:
+            stale_response = self.client.get(self.menu_items_url)
+        finally:
+            lock.release()
+        stale_names = [
+            item["product_name"] for item in json.loads(stale_response.content)["results"]
+        ]
+        self.assertIn("Pizza", stale_names)
+
+        # Once the lock is free the next request rebuilds the entry
+        fresh_response = self.client.get(self.menu_items_url)
+        fresh_names = [
+            item["product_name"] for item in json.loads(fresh_response.content)["results"]
+        ]
+        self.assertIn("Rebuilt Pizza", fresh_names)
+
+    def test_invalidation_message_evicts_local_namespaces(self):
+        local_cache.set("{Test:InvalidatedView}:generation", 3)
+        local_cache.set("{Test:InvalidatedView}:g3:Test_anon_cache_key", {})
+        local_cache.set("{Test:UntouchedView}:generation", 1)
+
+        # Another worker published an invalidation for one of the namespaces
+        handle_invalidation_message({"data": json.dumps(["Test:InvalidatedView"])})
+
+        self.assertIsNone(local_cache.get("{Test:InvalidatedView}:generation"))
+        self.assertIsNone(local_cache.get("{Test:InvalidatedView}:g3:Test_anon_cache_key"))
+        self.assertEqual(local_cache.get("{Test:UntouchedView}:generation"), 1)
+
+    def test_rendered_body_is_cached_compressed_with_envelope(self):
+        for index in range(40):
+            MenuItem.objects.create(
+                title=f"Special {index}", price=9.00, category=self.test_category
+            )
+        self.client.force_authenticate(user=self.user)
+        first_response = self.client.get(self.menu_items_url)
+
+        entry = cache.get(self.get_cache_key(self.user))
+        self.assertEqual(entry["encoding"], "gzip")
+
+        # Clients that accept gzip get the stored bytes as is
+        compressed_response = self.client.get(
+            self.menu_items_url, HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+        self.assertEqual(compressed_response["Content-Encoding"], "gzip")
+        self.assertEqual(compressed_response.content, entry["body"])
+
+        # Everyone else gets the same paginated envelope as on the miss
+        plain_response = self.client.get(self.menu_items_url)
+        self.assertFalse(plain_response.has_header("Content-Encoding"))
+        self.assertEqual(json.loads(plain_response.content), first_response.json())
+        self.assertIn("count", json.loads(plain_response.content))
+
+    def test_browsable_api_bypasses_rendered_cache(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.menu_items_url, HTTP_ACCEPT="text/html")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"testuser", response.content.lower())
+
+        # The page names the user and carries a CSRF token, so it must not be shared
+        html_key = self.get_cache_key(self.user).replace("_json_", "_api_")
+        self.assertIsNone(cache.get(html_key))
+        self.client.force_authenticate(user=self.manager)
+        response = self.client.get(self.menu_items_url, HTTP_ACCEPT="text/html")
+        self.assertNotIn(b"testuser", response.content.lower())
+
+    def test_public_menu_entry_is_shared_across_users(self):
         anonymous_client = APIClient()
-        response_anon = anonymous_client.get(self.menu_items_url)
-        self.assertEqual(response_anon.status_code, 200)
+        anonymous_client.get(self.menu_items_url)
+        self.assertIsNotNone(cache.get(self.get_cache_key(self.user)))
 
-        # Generate cache key for anonymous user
-        cache_key_anon = self.get_cache_key(User(is_authenticated=False))
+        # A different user is served the entry the anonymous request wrote
+        MenuItem.objects.filter(pk=self.menu_item1.pk).update(title="Not Yet Visible")
+        self.client.force_authenticate(user=self.manager)
+        response = self.client.get(self.menu_items_url)
+        titles = [item["product_name"] for item in response.json()["results"]]
+        self.assertIn("Pizza", titles)
 
-        # Check that anonymous user's data is cached separately
-        cached_data_anon = cache.get(cache_key_anon)
-        self.assertIsNotNone(cached_data_anon)
+    def test_equivalent_query_strings_share_a_cache_key(self):
+        self.client.get(self.menu_items_url, {"featured": "false", "category": 1})
+        canonical_key = self.get_cache_key(
+            self.user, "category=1&featured=false&limit=25&offset=0"
+        )
+        self.assertIsNotNone(cache.get(canonical_key))
 
-        # Ensure that the cache keys for authenticated and anonymous users are different
-        cache_key_user = self.get_cache_key(self.user)
-        self.assertNotEqual(cache_key_anon, cache_key_user)
+        # Reordered, differently spelled, defaulted and unknown parameters hit the same entry
+        MenuItem.objects.filter(pk=self.menu_item1.pk).update(title="Not Yet Visible")
+        response = self.client.get(
+            f"{self.menu_items_url}?category=1&featured=False&search=&limit=25&utm=x"
+        )
+        titles = [item["product_name"] for item in response.json()["results"]]
+        self.assertIn("Pizza", titles)
+
+    def test_search_terms_keep_their_order(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.menu_items_url, {"search": "  Pizza   BURGER "})
+
+        self.assertIsNotNone(
+            cache.get(
+                self.get_cache_key(self.user, "limit=25&offset=0&search=pizza+burger")
+            )
+        )
+        self.assertIsNone(
+            cache.get(
+                self.get_cache_key(self.user, "limit=25&offset=0&search=burger+pizza")
+            )
+        )
+
+    def test_row_change_only_invalidates_its_own_detail_entry(self):
+        self.client.force_authenticate(user=self.user)
+        item1_url = reverse("items-detail", args=[self.menu_item1.pk])
+        item2_url = reverse("items-detail", args=[self.menu_item2.pk])
+        self.client.get(item1_url)
+        self.client.get(item2_url)
+        detail_generation = get_namespace_generation("MenuItem:MenuItemDetailView")
+        row_namespace = f"MenuItem:pk:{self.menu_item1.pk}"
+        row_generation = get_namespace_generation(row_namespace)
+
+        MenuItem.objects.filter(pk=self.menu_item2.pk).update(title="Not Yet Visible")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.title = "Row Pizza"
+            self.menu_item1.save()
+
+        # Only the saved row moved to a new generation, the other entry is still served
+        self.assertEqual(
+            get_namespace_generation("MenuItem:MenuItemDetailView"), detail_generation
+        )
+        self.assertEqual(get_namespace_generation(row_namespace), row_generation + 1)
+        response1 = self.client.get(item1_url)
+        response2 = self.client.get(item2_url)
+        self.assertEqual(response1.json()["product_name"], "Row Pizza")
+        self.assertEqual(response2.json()["product_name"], "Burger")
+
+    def test_matching_etag_returns_not_modified_without_queries(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.menu_items_url)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(self.menu_items_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], etag)
+
+        # A change to the menu moves the list to a new representation
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.title = "Changed Pizza"
+            self.menu_item1.save()
+        changed = self.client.get(self.menu_items_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_order_list_honours_if_modified_since(self):
+        self.client.force_authenticate(user=self.user)
+        Order.objects.create(user=self.user, total=10.00)
+        orders_url = reverse("Order-Management")
+        response = self.client.get(orders_url)
+        self.assertEqual(response.status_code, 200)
+
+        not_modified = self.client.get(
+            orders_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_entries_record_compute_time_and_jittered_ttl(self):
+        self.client.force_authenticate(user=self.user)
+        with override_settings(VIEW_CACHE_TTL=100, VIEW_CACHE_TTL_JITTER=0.1):
+            self.client.get(self.menu_items_url)
+        entry = cache.get(self.get_cache_key(self.user))
+        self.assertGreater(entry["delta"], 0)
+        self.assertGreaterEqual(entry["fresh_until"] - entry["stored_at"], 90)
+        self.assertLessEqual(entry["fresh_until"] - entry["stored_at"], 110)
+
+    def test_expensive_entry_near_expiry_is_recomputed_early(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.menu_items_url)
+        cache_key = self.get_cache_key(self.user)
+        entry = cache.get(cache_key)
+        # A second of compute time with under a second of freshness left
+        entry.update(delta=1.0, fresh_until=time.time() + 0.5)
+        cache.set(cache_key, entry)
+        local_cache.clear()
+
+        # Bypasses the signals, only a recomputed entry can list the new item
+        MenuItem.objects.bulk_create(
+            [MenuItem(title="Early Pizza", price=9.00, category=self.test_category)]
+        )
+        with patch("little_lemon.utils.cache.random.random", return_value=0.9):
+            response = self.client.get(self.menu_items_url)
+        titles = [item["product_name"] for item in response.json()["results"]]
+        self.assertIn("Early Pizza", titles)
+
+    def test_missing_item_is_negatively_cached_until_created(self):
+        self.client.force_authenticate(user=self.user)
+        missing_url = reverse("items-detail", args=[999])
+        self.assertEqual(self.client.get(missing_url).status_code, 404)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(missing_url).status_code, 404)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MenuItem.objects.create(
+                item_id=999, title="Back", price=4.00, category=self.test_category
+            )
+        response = self.client.get(missing_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["product_name"], "Back")
+
+    @override_settings(VIEW_CACHE_LOCK_WAIT=0.1)
+    def test_stale_negative_entry_is_not_served_once_created(self):
+        self.client.force_authenticate(user=self.user)
+        missing_url = reverse("items-detail", args=[999])
+        self.assertEqual(self.client.get(missing_url).status_code, 404)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MenuItem.objects.create(
+                item_id=999, title="Back", price=4.00, category=self.test_category
+            )
+
+        # Simulate another worker rebuilding the entry after the invalidation
+        cache_key = self.get_view_cache_key(
+            MenuItemDetailView, self.user, missing_url, item_id=999
+        )
+        lock = cache.lock(f"{cache_key}:lock", timeout=10)
+        self.assertTrue(lock.acquire(blocking=False))
+        try:
+            response = self.client.get(missing_url)
+        finally:
+            lock.release()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["product_name"], "Back")
+
+    def test_missing_order_is_negatively_cached(self):
+        self.client.force_authenticate(user=self.user)
+        order = Order.objects.create(user=self.user, total=10.00)
+        missing_url = reverse("Order-Detail-Management", args=[order.pk + 1])
+        self.assertEqual(self.client.get(missing_url).status_code, 404)
+        self.assertEqual(
+            self.client.get(
+                reverse("Order-Detail-Management", args=[order.pk])
+            ).status_code,
+            200,
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(missing_url).status_code, 404)
+
+    def test_list_rebuild_only_serializes_changed_items(self):
+        self.client.get(self.menu_items_url)
+
+        self.menu_item1.title = "Updated Pizza"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.save()
+
+        with patch.object(
+            MenuItemSerializer,
+            "represent_values",
+            side_effect=MenuItemSerializer.represent_values,
+        ) as represent_values:
+            response = self.client.get(self.menu_items_url)
+
+        self.assertEqual(represent_values.call_count, 1)
+        self.assertEqual(represent_values.call_args.args[0]["pk"], self.menu_item1.pk)
+        names = [item["product_name"] for item in response.json()["results"]]
+        self.assertCountEqual(names, ["Updated Pizza", "Burger"])
+
+    def test_namespace_budget_evicts_least_recently_used_entries(self):
+        self.client.force_authenticate(user=self.user)
+        budgets = {"MenuItem:MenuItemsListView": {"max_entries": 2}}
+        with override_settings(VIEW_CACHE_NAMESPACE_BUDGETS=budgets):
+            self.client.get(self.menu_items_url, {"offset": 0})
+            self.client.get(self.menu_items_url, {"offset": 1})
+            # Reading the first entry from Redis makes the second the least recently used
+            local_cache.clear()
+            self.client.get(self.menu_items_url, {"offset": 0})
+            self.client.get(self.menu_items_url, {"offset": 2})
+
+        self.assertIsNotNone(cache.get(self.get_cache_key(self.user)))
+        self.assertIsNone(cache.get(self.get_cache_key(self.user, "limit=25&offset=1")))
+        self.assertIsNotNone(
+            cache.get(self.get_cache_key(self.user, "limit=25&offset=2"))
+        )
+
+    def test_expired_entries_stop_counting_against_the_budget(self):
+        namespace = "MenuItem:MenuItemsListView"
+        lru_key, sizes_key, _, expiries_key = budget_index_keys(namespace)
+        client = cache.client.get_client_for_key(lru_key)
+        budgets = {namespace: {"max_entries": 2}}
+        with override_settings(VIEW_CACHE_NAMESPACE_BUDGETS=budgets):
+            self.client.get(self.menu_items_url, {"offset": 0})
+            expired_key = cache.client.make_key(self.get_cache_key(self.user))
+            # Let the first entry expire on its own
+            client.delete(expired_key)
+            client.zadd(expiries_key, {expired_key: 0})
+            self.client.get(self.menu_items_url, {"offset": 1})
+            self.client.get(self.menu_items_url, {"offset": 2})
+
+        self.assertEqual(client.zcard(lru_key), 2)
+        self.assertFalse(client.hexists(sizes_key, expired_key))
+        # Two live entries fit the budget, so neither was evicted
+        for offset in (1, 2):
+            key = self.get_cache_key(self.user, f"limit=25&offset={offset}")
+            self.assertIsNotNone(cache.get(key))
+
+    def test_budget_indexes_outlive_the_longest_jittered_entry(self):
+        self.client.force_authenticate(user=self.user)
+        namespace = MenuItemDetailView.get_cache_namespace()
+        lru_key = budget_index_keys(namespace)[0]
+        client = cache.client.get_client_for_key(lru_key)
+        budgets = {namespace: {"max_entries": 10}}
+        detail_url = reverse("items-detail", args=[self.menu_item1.pk])
+        with override_settings(
+            VIEW_CACHE_NAMESPACE_BUDGETS=budgets,
+            VIEW_CACHE_TTL=100,
+            VIEW_CACHE_STALE_TTL=30,
+        ), patch(
+            "little_lemon.utils.cache.random.uniform", side_effect=lambda a, b: b
+        ):
+            self.client.get(detail_url)
+
+        entry_key = client.zrange(lru_key, 0, 0)[0]
+        # The detail view jitters its TTL by up to 20%
+        self.assertEqual(client.ttl(entry_key), 150)
+        self.assertGreaterEqual(client.ttl(lru_key), client.ttl(entry_key))
+
+    def test_fresh_data_after_invalidation(self):
+        # Cache the data
+        self.client.get(self.menu_items_url)
+
+        # Update a menu item
+        self.menu_item1.title = "Fresh Pizza"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.save()
+
+        # Make a new request
+        response = self.client.get(self.menu_items_url)
+
+        # The response should have fresh data
+        self.assertIn("Fresh Pizza", self.get_titles(response))
+
+    def get_view_cache_key(self, view_class, user, url, **kwargs):
+        request = APIRequestFactory().get(url, HTTP_ACCEPT="application/json")
+        if user is not None:
+            force_authenticate(request, user=user)
+        view = view_class(throttle_classes=[])
+        view.setup(request, **kwargs)
+        view.request = view.initialize_request(request)
+        view.initial(view.request)
+        return view.get_cache_key()
+
+    def test_public_menu_key_is_shared_by_every_user(self):
+        anonymous_key = self.get_view_cache_key(
+            MenuItemsListView, None, self.menu_items_url
+        )
+        user_key = self.get_view_cache_key(
+            MenuItemsListView, self.user, self.menu_items_url
+        )
+        self.assertEqual(anonymous_key, user_key)
+        self.assertEqual(user_key, self.get_cache_key(self.user))
+
+        # The anonymous request writes the one entry the authenticated user is served
+        self.assertEqual(APIClient().get(self.menu_items_url).status_code, 200)
+        entry = cache.get(user_key)
+        self.assertIsNotNone(entry)
+        MenuItem.objects.filter(pk=self.menu_item1.pk).update(title="Not Yet Visible")
+        local_cache.clear()
+        response = self.client.get(self.menu_items_url)
+        self.assertEqual(response.content, entry["body"])
+
+    def test_order_keys_are_per_user(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.create(user=self.user, total=10.00)
+            Order.objects.create(user=self.manager, total=20.00)
+        orders_url = reverse("Order-Management")
+
+        user_key = self.get_view_cache_key(OrderManagement, self.user, orders_url)
+        manager_key = self.get_view_cache_key(OrderManagement, self.manager, orders_url)
+        self.assertNotEqual(user_key, manager_key)
+
+        self.client.force_authenticate(user=self.user)
+        user_orders = self.client.get(orders_url).json()["results"]
+        self.client.force_authenticate(user=self.manager)
+        manager_orders = self.client.get(orders_url).json()["results"]
+        self.assertIsNotNone(cache.get(user_key))
+        self.assertIsNotNone(cache.get(manager_key))
+        self.assertNotEqual(user_orders, manager_orders)
 
     def test_cache_with_query_parameters(self):
         # Make a request with a filter
         response_filtered = self.client.get(self.menu_items_url, {"search": "Pizza"})
         self.assertEqual(response_filtered.status_code, 200)
-        self.assertEqual(len(response_filtered.data), 1)
-        self.assertEqual(response_filtered.data[0]["title"], "Pizza")
+        self.assertEqual(self.get_titles(response_filtered), ["Pizza"])
 
         # Generate the cache key with query parameters
-        query_params = "search=Pizza"
+        query_params = "limit=25&offset=0&search=pizza"
         cache_key = self.get_cache_key(self.user, query_params)
 
         # Check that filtered data is cached
         cached_data = cache.get(cache_key)
         self.assertIsNotNone(cached_data)
-        self.assertEqual(len(cached_data), 1)
-        self.assertEqual(cached_data[0]["title"], "Pizza")
+        cached_results = json.loads(cached_data["body"])["results"]
+        self.assertEqual(len(cached_results), 1)
+        self.assertEqual(cached_results[0]["product_name"], "Pizza")
 
         # Ensure that the cache key is different from the one without query parameters
         default_cache_key = self.get_cache_key(self.user)
@@ -214,7 +666,8 @@ class CachingMechanismTestCase(TestCase):
 
         # Update a menu item
         self.menu_item1.title = "Manager Updated Pizza"
-        self.menu_item1.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.save()
 
         # Check that both caches are invalidated
         cache_key_user = self.get_cache_key(self.user)
@@ -228,8 +681,8 @@ class CachingMechanismTestCase(TestCase):
         response_manager = self.manager_client.get(self.menu_items_url)
 
         # Both responses should have the updated data
-        self.assertEqual(response_user.data[0]["title"], "Manager Updated Pizza")
-        self.assertEqual(response_manager.data[0]["title"], "Manager Updated Pizza")
+        self.assertIn("Manager Updated Pizza", self.get_titles(response_user))
+        self.assertIn("Manager Updated Pizza", self.get_titles(response_manager))
 
     def test_cache_invalidation_across_multiple_views(self):
         # Assuming there's another view that also caches MenuItem data
@@ -241,7 +694,8 @@ class CachingMechanismTestCase(TestCase):
 
         # Update a menu item
         self.menu_item1.title = "Updated Across Views"
-        self.menu_item1.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item1.save()
 
         # Generate cache keys for both views
         cache_key_main_view = self.get_cache_key(self.user)
@@ -256,8 +710,8 @@ class CachingMechanismTestCase(TestCase):
         response_other = self.client.get(other_view_url)
 
         # Both responses should have the updated data
-        self.assertEqual(response_main.data[0]["title"], "Updated Across Views")
-        self.assertEqual(response_other.data[0]["title"], "Updated Across Views")
+        self.assertIn("Updated Across Views", self.get_titles(response_main))
+        self.assertIn("Updated Across Views", self.get_titles(response_other))
 
     def test_performance_with_caching(self):
         import time
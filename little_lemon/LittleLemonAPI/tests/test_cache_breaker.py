@@ -0,0 +1,109 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from redis.exceptions import ConnectionError
+from rest_framework.test import APIClient
+
+from little_lemon.utils.cache import (CachedResponseMixin, cache_breaker,
+                                      ensure_invalidation_listener,
+                                      get_namespace_generation, local_cache,
+                                      namespace_generation_key)
+from little_lemon.utils.cache_breaker import BREAKER_CLOSED, BREAKER_OPEN
+from LittleLemonAPI.models import Category, MenuItem
+from LittleLemonAPI.views import MenuItemsListView
+
+
+@patch.object(cache_breaker, "failure_threshold", 2)
+class CacheCircuitBreakerTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        cache_breaker.reset()
+        self.addCleanup(cache_breaker.reset)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username="testuser", password="x")
+            category = Category.objects.create(title="TEST", slug="test")
+            self.menu_item = MenuItem.objects.create(
+                title="Pizza", price=10.00, category=category
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.menu_items_url = reverse("items-list")
+
+    def test_cache_failures_open_the_breaker_and_bypass_redis(self):
+        with patch(
+            "little_lemon.utils.cache.get_namespace_generations",
+            side_effect=ConnectionError("Redis is down"),
+        ) as get_generations:
+            for _ in range(3):
+                response = self.client.get(self.menu_items_url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()["results"]), 1)
+
+        self.assertEqual(get_generations.call_count, 2)
+        self.assertEqual(cache_breaker.state, BREAKER_OPEN)
+
+        with patch.object(cache_breaker, "recovery_timeout", 0):
+            self.assertEqual(self.client.get(self.menu_items_url).status_code, 200)
+        self.assertEqual(cache_breaker.state, BREAKER_CLOSED)
+
+    def test_invalidation_during_outage_is_applied_on_recovery(self):
+        namespace = "MenuItem:MenuItemsListView"
+        generation = get_namespace_generation(namespace)
+        cache_breaker.record_failure()
+        cache_breaker.record_failure()
+
+        self.menu_item.title = "Updated Pizza"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item.save()
+        self.assertEqual(cache.get(namespace_generation_key(namespace), 0), generation)
+
+        with patch.object(cache_breaker, "recovery_timeout", 0):
+            response = self.client.get(self.menu_items_url)
+        self.assertEqual(response.json()["results"][0]["product_name"], "Updated Pizza")
+        self.assertEqual(get_namespace_generation(namespace), generation + 1)
+
+    def test_probe_failing_for_other_reasons_still_closes_the_breaker(self):
+        cache_breaker.record_failure()
+        cache_breaker.record_failure()
+
+        # The probe is answered with a 404, which says nothing about Redis
+        with patch.object(cache_breaker, "recovery_timeout", 0):
+            response = self.client.get(self.menu_items_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(cache_breaker.state, BREAKER_CLOSED)
+        self.assertTrue(cache_breaker.allow_request())
+
+    def test_failed_cache_write_serves_the_built_response(self):
+        cache.clear()
+        local_cache.clear()
+
+        with patch.object(
+            CachedResponseMixin,
+            "cache_response",
+            side_effect=ConnectionError("Redis is down"),
+        ), patch.object(
+            MenuItemsListView,
+            "filter_queryset",
+            autospec=True,
+            side_effect=lambda view, queryset: queryset,
+        ) as filter_queryset:
+            response = self.client.get(self.menu_items_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 1)
+        # The page was built once, not again on the bypass path
+        self.assertEqual(filter_queryset.call_count, 1)
+
+    def test_listener_is_not_resubscribed_while_the_breaker_is_open(self):
+        cache_breaker.record_failure()
+        cache_breaker.record_failure()
+
+        with patch(
+            "little_lemon.utils.cache._invalidation_listener_pid", None
+        ), patch.object(cache.client, "get_client_for_key") as get_client:
+            self.assertFalse(ensure_invalidation_listener())
+        get_client.assert_not_called()
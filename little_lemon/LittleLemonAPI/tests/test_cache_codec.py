@@ -0,0 +1,54 @@
+import datetime
+import pickle
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from little_lemon.utils.cache_codec import (MSGPACK_MARKER, MsgpackSerializer,
+                                            ThresholdCompressor, key_model)
+
+
+class CacheCodecTestCase(SimpleTestCase):
+    def setUp(self):
+        self.serializer = MsgpackSerializer(options={})
+        self.compressor = ThresholdCompressor(
+            options={"COMPRESS_MIN_BYTES": 64, "COMPRESS_ENCODING": "gzip"}
+        )
+
+    def test_cache_entries_round_trip_through_msgpack(self):
+        entry = {
+            "data": [
+                {"product_name": "Pizza", "price": Decimal("10.50"), "featured": False},
+            ],
+            "status": 200,
+            "fresh_until": 1700000000.5,
+            "body": b"\x1f\x8b compressed",
+            "encoding": None,
+            "date": datetime.date(2024, 5, 1),
+            "placed_at": datetime.datetime(2024, 5, 1, 12, 30),
+        }
+        encoded = self.serializer.dumps(entry)
+        self.assertEqual(encoded[:1], MSGPACK_MARKER)
+        self.assertEqual(self.serializer.loads(encoded), entry)
+        self.assertLess(len(encoded), len(pickle.dumps(entry)))
+
+    def test_unsupported_values_fall_back_to_pickle(self):
+        value = ("tuple", {"kept": "as a tuple"})
+        encoded = self.serializer.dumps(value)
+        self.assertNotEqual(encoded[:1], MSGPACK_MARKER)
+        self.assertEqual(self.serializer.loads(encoded), value)
+        # Values pickled before the codec was introduced remain readable
+        self.assertEqual(self.serializer.loads(pickle.dumps({"a": 1})), {"a": 1})
+
+    def test_only_values_above_threshold_are_compressed(self):
+        small = self.serializer.dumps({"a": 1})
+        self.assertEqual(self.compressor.compress(small), small)
+
+        large = self.serializer.dumps({"allergens": ["gluten"] * 100})
+        compressed = self.compressor.compress(large)
+        self.assertLess(len(compressed), len(large))
+        self.assertEqual(self.compressor.decompress(compressed), large)
+
+    def test_key_model_bounds_label_cardinality(self):
+        self.assertEqual(key_model("{MenuItem:pk:42}:generation"), "MenuItem")
+        self.assertEqual(key_model("throttle_user_1"), "other")
@@ -0,0 +1,63 @@
+import os
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from prometheus_client import REGISTRY
+from redis.exceptions import ConnectionError
+
+from little_lemon.utils.cache_pool import (InstrumentedBlockingConnectionPool,
+                                           pool_size_for_threads)
+
+# fakeredis is a dev dependency, installs without the dev group skip these tests
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class InstrumentedConnectionPoolTestCase(SimpleTestCase):
+    def setUp(self):
+        self.pool = InstrumentedBlockingConnectionPool(
+            max_connections=1,
+            timeout=0.01,
+            wait_warning_threshold=0,
+            connection_class=fakeredis.FakeConnection,
+            server=fakeredis.FakeServer(),
+            host="cache-test",
+        )
+        self.labels = {"worker": str(os.getpid()), "node": "cache-test:6379/0"}
+
+    def sample(self, name: str) -> float:
+        return REGISTRY.get_sample_value(name, self.labels) or 0
+
+    def test_checkouts_are_timed_and_counted_in_use(self):
+        checkouts = self.sample("cached_queryset_pool_checkout_seconds_count")
+        with patch("little_lemon.utils.cache_pool.logger") as logger:
+            connection = self.pool.get_connection("GET")
+        logger.warning.assert_called_once()
+        self.assertEqual(self.sample("cached_queryset_pool_in_use"), 1)
+        self.assertEqual(self.sample("cached_queryset_pool_max_connections"), 1)
+
+        self.pool.release(connection)
+        self.assertEqual(self.sample("cached_queryset_pool_in_use"), 0)
+        self.assertEqual(
+            self.sample("cached_queryset_pool_checkout_seconds_count"), checkouts + 1
+        )
+
+    def test_exhausted_pool_is_counted(self):
+        exhausted = self.sample("cached_queryset_pool_exhausted_total")
+        connection = self.pool.get_connection("GET")
+        with self.assertRaises(ConnectionError):
+            self.pool.get_connection("GET")
+        self.pool.release(connection)
+        self.assertEqual(
+            self.sample("cached_queryset_pool_exhausted_total"), exhausted + 1
+        )
+
+
+class PoolSizeTestCase(SimpleTestCase):
+    def test_pool_size_follows_thread_count(self):
+        self.assertEqual(pool_size_for_threads(1), 3)
+        self.assertEqual(pool_size_for_threads(8), 10)
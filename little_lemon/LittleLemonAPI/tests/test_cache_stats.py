@@ -0,0 +1,65 @@
+from io import StringIO
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from little_lemon.utils.cache import local_cache
+from LittleLemonAPI.models import Category, MenuItem
+
+
+@override_settings(VIEW_CACHE_STATS_SAMPLE_RATE=1.0)
+class CacheStatsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username="testuser", password="x")
+            self.manager = User.objects.create_user(username="manager", password="x")
+            manager_group, created = Group.objects.get_or_create(name="manager")
+            self.manager.groups.add(manager_group)
+            category = Category.objects.create(title="TEST", slug="test")
+            MenuItem.objects.create(title="Pizza", price=10.00, category=category)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager)
+        self.stats_url = reverse("Cache-Stats")
+
+    def test_stats_report_namespace_size_hit_ratio_and_hot_keys(self):
+        for _ in range(3):
+            self.client.get(reverse("items-list"))
+
+        response = self.client.get(self.stats_url, {"top": 1})
+        self.assertEqual(response.status_code, 200)
+        report = next(
+            r for r in response.json() if r["namespace"] == "MenuItem:MenuItemsListView"
+        )
+        self.assertGreater(report["keys"], 0)
+        self.assertGreater(report["bytes"], 0)
+        self.assertAlmostEqual(report["hit_ratio"], 2 / 3)
+        self.assertEqual(len(report["hot_keys"]), 1)
+        self.assertEqual(report["hot_keys"][0]["estimated_reads"], 3)
+
+        output = StringIO()
+        call_command("cache_stats", top=1, stdout=output)
+        self.assertIn("MenuItem:MenuItemsListView", output.getvalue())
+
+    def test_stats_are_restricted_to_managers(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(self.stats_url).status_code, 403)
+
+    @override_settings(VIEW_CACHE_STATS_MAX_TOP=1)
+    def test_top_must_be_positive_and_is_capped(self):
+        for top in (0, -1, "many"):
+            response = self.client.get(self.stats_url, {"top": top})
+            self.assertEqual(response.status_code, 400)
+
+        self.client.get(reverse("items-list"))
+        self.client.get(reverse("items-list"), {"featured": "true"})
+        response = self.client.get(self.stats_url, {"top": 50})
+        report = next(
+            r for r in response.json() if r["namespace"] == "MenuItem:MenuItemsListView"
+        )
+        self.assertEqual(len(report["hot_keys"]), 1)
@@ -0,0 +1,54 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from LittleLemonAPI.models import Category, MenuItem
+from LittleLemonAPI.serializers import (MenuItemDetailSerializer,
+                                        MenuItemSerializer)
+
+
+class MenuSerializerFastPathTestCase(TestCase):
+    def setUp(self):
+        category = Category.objects.create(title="Mains", slug="mains")
+        MenuItem.objects.create(title="Pizza", price=10.00, category=category)
+        MenuItem.objects.create(
+            title="Salad",
+            price="7.5",
+            category=category,
+            featured=True,
+            calories=320,
+            sugar_gm="4.25",
+            protein_gm=12,
+            carbohydrates_mg="0.1",
+            saturated_fat_gm="1.00",
+            contains_dairy=True,
+            contains_gluten=False,
+            is_on_sale=True,
+        )
+        self.queryset = MenuItem.objects.select_related("category")
+
+    def assertFastPathMatches(self, serializer_class):
+        expected = serializer_class(self.queryset, many=True).data
+        fast = [
+            serializer_class.represent_values(row)
+            for row in self.queryset.values(*serializer_class.values_fields)
+        ]
+        self.assertEqual(fast, expected)
+        # Equal values of another type would still change the rendered JSON
+        for fast_item, expected_item in zip(fast, expected):
+            for key, value in expected_item.items():
+                self.assertIs(type(fast_item[key]), type(value), key)
+
+    def test_list_fast_path_matches_serializer(self):
+        self.assertFastPathMatches(MenuItemSerializer)
+
+    def test_detail_fast_path_matches_serializer(self):
+        self.assertFastPathMatches(MenuItemDetailSerializer)
+
+    def test_benchmark_reports_both_paths(self):
+        output = StringIO()
+        call_command("benchmark_serializers", items=50, repeat=1, stdout=output)
+        self.assertIn("MenuItemDetailSerializer", output.getvalue())
+        self.assertIn("values=", output.getvalue())
+        self.assertEqual(MenuItem.objects.count(), 2)
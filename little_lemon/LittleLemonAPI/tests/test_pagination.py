@@ -0,0 +1,117 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from little_lemon.utils.cache import local_cache
+from little_lemon.utils.pagination import KeysetPagination
+from LittleLemonAPI.models import Category, MenuItem, Order
+from LittleLemonAPI.tests.query_budget import QueryBudgetMixin
+
+
+class KeysetPaginationTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username="testuser", password="x")
+            categories = [
+                Category.objects.create(title=f"Category {index}", slug=f"c{index}")
+                for index in range(3)
+            ]
+            # Repeated titles, so the item id has to break ties within a category
+            MenuItem.objects.bulk_create(
+                MenuItem(
+                    title=f"Item {index % 4}",
+                    price=5.00,
+                    category=categories[index % 3],
+                )
+                for index in range(20)
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.menu_items_url = reverse("items-list")
+
+    def walk(self, url: str, limit: int) -> list:
+        pages = []
+        response = self.client.get(url, {"cursor": "", "limit": limit})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertNotIn("count", body)
+            pages.append(body["results"])
+            if body["next"] is None:
+                return pages
+            response = self.client.get(body["next"])
+
+    def test_cursor_pages_walk_the_keyset_ordering(self):
+        pages = self.walk(self.menu_items_url, limit=6)
+
+        self.assertEqual([len(page) for page in pages], [6, 6, 6, 2])
+        expected = MenuItem.objects.order_by("category_id", "title", "item_id")
+        self.assertEqual(
+            [item["product_sku"] for page in pages for item in page],
+            list(expected.values_list("item_id", flat=True)),
+        )
+
+    def test_rows_inserted_before_the_cursor_do_not_shift_later_pages(self):
+        first = self.client.get(self.menu_items_url, {"cursor": "", "limit": 5}).json()
+        with self.captureOnCommitCallbacks(execute=True):
+            MenuItem.objects.create(
+                title="A new item",
+                price=5.00,
+                category=Category.objects.order_by("pk").first(),
+            )
+        second = self.client.get(first["next"]).json()
+
+        seen = {item["product_sku"] for item in first["results"]}
+        self.assertFalse(seen & {item["product_sku"] for item in second["results"]})
+        self.assertEqual(len(second["results"]), 5)
+
+    def test_limit_offset_stays_the_default(self):
+        body = self.client.get(self.menu_items_url, {"limit": 5, "offset": 5}).json()
+
+        self.assertEqual(body["count"], 20)
+        self.assertEqual(len(body["results"]), 5)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.menu_items_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_ill_typed_cursor_is_not_found(self):
+        paginator = KeysetPagination()
+        for url, position in (
+            (reverse("Order-Management"), ["x", {}]),
+            (reverse("Order-Management"), ["2024-01-01", None]),
+            (self.menu_items_url, [{}, "Item 1", 1]),
+        ):
+            cursor = paginator.encode_position(position)
+            response = self.client.get(url, {"cursor": cursor})
+            self.assertEqual(response.status_code, 404, position)
+
+    def test_deep_keyset_pages_run_the_same_queries_as_the_first(self):
+        urls = [f"{self.menu_items_url}?cursor=&limit=1"]
+        response = self.client.get(urls[0])
+        while response.json()["next"]:
+            urls.append(response.json()["next"])
+            response = self.client.get(urls[-1])
+
+        def request(depth):
+            response = self.client.get(urls[depth])
+            self.assertEqual(len(response.json()["results"]), 1)
+
+        # Page keys and the page's items with their categories, no count
+        self.assertQueryBudget(request, sizes=[0, 10, 19], budget=2)
+
+    def test_orders_page_by_date_and_id(self):
+        orders = Order.objects.bulk_create(
+            Order(user=self.user, total=10) for _ in range(5)
+        )
+        pages = self.walk(reverse("Order-Management"), limit=2)
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(
+            [order["id"] for page in pages for order in page],
+            [order.pk for order in orders],
+        )
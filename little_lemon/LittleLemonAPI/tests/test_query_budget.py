@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from LittleLemonAPI.models import Category, MenuItem, Order, OrderItem
+from LittleLemonAPI.tests.query_budget import QueryBudgetMixin
+
+
+class MenuQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username="testuser", password="x")
+            categories = [
+                Category.objects.create(title=f"Category {index}", slug=f"c{index}")
+                for index in range(5)
+            ]
+            MenuItem.objects.bulk_create(
+                MenuItem(
+                    title=f"Item {index}", price=5.00, category=categories[index % 5]
+                )
+                for index in range(30)
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_menu_list_runs_a_constant_number_of_queries(self):
+        def request(size):
+            response = self.client.get(reverse("items-list"), {"limit": size})
+            self.assertEqual(len(response.json()["results"]), size)
+
+        # Count, page keys and the page's items with their categories
+        self.assertQueryBudget(request, sizes=[1, 10, 30], budget=3)
+
+    def test_menu_item_detail_runs_one_query(self):
+        # Items ordered a different number of times catch queries per related row
+        orders = [Order.objects.create(user=self.user, total=5.00) for _ in range(10)]
+        items = {}
+        for size, item in zip((0, 1, 10), MenuItem.objects.order_by("pk")):
+            OrderItem.objects.bulk_create(
+                OrderItem(order=order, menuitem=item, quantity=1, unit_price=5.00)
+                for order in orders[:size]
+            )
+            items[size] = item
+
+        def request(size):
+            response = self.client.get(reverse("items-detail", args=[items[size].pk]))
+            self.assertEqual(response.status_code, 200)
+
+        self.assertQueryBudget(request, sizes=list(items), budget=1)
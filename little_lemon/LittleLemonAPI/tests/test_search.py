@@ -0,0 +1,54 @@
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from little_lemon.utils.cache import local_cache
+from LittleLemonAPI.models import Category, MenuItem
+
+
+class MenuSearchTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username="testuser", password="x")
+            category = Category.objects.create(title="Mains", slug="mains")
+            for title in (
+                "Pizza Margherita",
+                "Pizza Bianca",
+                "Greek Salad",
+                "Lemon Dessert",
+                "Margherita and Salad Combo",
+            ):
+                MenuItem.objects.create(title=title, price=10.00, category=category)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def search(self, term: str) -> list:
+        response = self.client.get(reverse("items-list"), {"search": term})
+        self.assertEqual(response.status_code, 200)
+        return [item["product_name"] for item in response.json()["results"]]
+
+    def test_search_matches_titles(self):
+        self.assertCountEqual(
+            self.search("pizza"), ["Pizza Margherita", "Pizza Bianca"]
+        )
+        self.assertEqual(self.search("dessert lemon"), ["Lemon Dessert"])
+        self.assertEqual(self.search("ssert"), ["Lemon Dessert"])
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search needs Postgres")
+    def test_search_is_stemmed_and_tolerates_typos(self):
+        self.assertCountEqual(
+            self.search("pizzas"), ["Pizza Margherita", "Pizza Bianca"]
+        )
+        self.assertIn("Pizza Margherita", self.search("margarita"))
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search needs Postgres")
+    def test_search_orders_by_relevance(self):
+        results = self.search("margherita pizza")
+        self.assertEqual(results[0], "Pizza Margherita")
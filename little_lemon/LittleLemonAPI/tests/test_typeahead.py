@@ -0,0 +1,122 @@
+import json
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from little_lemon.utils.cache import (handle_invalidation_message,
+                                      row_cache_registry)
+from little_lemon.utils.prefix_index import PrefixIndex
+from LittleLemonAPI.models import Category, MenuItem
+from LittleLemonAPI.views import menu_typeahead_index
+
+
+class PrefixIndexTestCase(SimpleTestCase):
+    def test_title_matches_rank_first_within_the_limit(self):
+        index = PrefixIndex()
+        index.replace(
+            [
+                ("item", 1, "Alfredo Pasta"),
+                ("item", 2, "Lemon Pie"),
+                ("item", 3, "Pizza"),
+                ("item", 4, "Apple Pie"),
+                ("category", 5, "Pies"),
+            ]
+        )
+
+        self.assertEqual([m["title"] for m in index.search("p", 1)], ["Pies"])
+        self.assertEqual(
+            [m["title"] for m in index.search("p", 3)],
+            ["Pies", "Pizza", "Alfredo Pasta"],
+        )
+        self.assertEqual(
+            [m["title"] for m in index.search("pie", 5)],
+            ["Pies", "Apple Pie", "Lemon Pie"],
+        )
+
+
+# Rows are committed, since the invalidation listener reloads them from its own thread
+class MenuTypeaheadTestCase(TransactionTestCase):
+    def setUp(self):
+        menu_typeahead_index.expire()
+        self.addCleanup(menu_typeahead_index.expire)
+        self.user = User.objects.create_user(username="testuser", password="x")
+        self.category = Category.objects.create(title="Pizzas", slug="pizzas")
+        self.margherita = MenuItem.objects.create(
+            title="Pizza Margherita", price=10.00, category=self.category
+        )
+        MenuItem.objects.create(
+            title="Lemon Pizza Bianca", price=10.00, category=self.category
+        )
+        MenuItem.objects.create(
+            title="Greek Salad", price=10.00, category=self.category
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.typeahead_url = reverse("items-typeahead")
+
+    def suggest(self, q: str, **params) -> list:
+        response = self.client.get(self.typeahead_url, {"q": q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(item["type"], item["title"]) for item in response.json()["results"]]
+
+    def test_suggestions_match_word_prefixes_without_queries(self):
+        self.suggest("p")
+
+        with self.assertNumQueries(0):
+            suggestions = self.suggest("  PIZ")
+        self.assertEqual(
+            suggestions,
+            [
+                ("item", "Pizza Margherita"),
+                ("category", "Pizzas"),
+                ("item", "Lemon Pizza Bianca"),
+            ],
+        )
+        self.assertEqual(self.suggest("pizza bi"), [("item", "Lemon Pizza Bianca")])
+        self.assertEqual(len(self.suggest("piz", limit=1)), 1)
+        self.assertEqual(self.suggest(""), [])
+
+    def test_saves_and_deletes_update_the_index(self):
+        self.suggest("p")
+
+        with transaction.atomic():
+            self.margherita.title = "Pepperoni Pizza"
+            self.margherita.save()
+            MenuItem.objects.create(
+                title="Margherita Flatbread", price=8.00, category=self.category
+            )
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest("pep"), [("item", "Pepperoni Pizza")])
+            self.assertEqual(self.suggest("marg"), [("item", "Margherita Flatbread")])
+
+        self.margherita.delete()
+        self.assertEqual(self.suggest("pep"), [])
+
+    def test_saves_in_other_workers_reload_their_rows(self):
+        self.suggest("p")
+        self.assertIn(Category, row_cache_registry)
+
+        # Another worker's save: no signal here, only its invalidation message
+        MenuItem.objects.filter(pk=self.margherita.pk).update(title="Calzone")
+        Category.objects.filter(pk=self.category.pk).update(title="Calzones")
+        handle_invalidation_message(
+            {
+                "data": json.dumps(
+                    [
+                        f"MenuItem:pk:{self.margherita.pk}",
+                        f"Category:pk:{self.category.pk}",
+                    ]
+                )
+            }
+        )
+
+        self.assertEqual(
+            self.suggest("calz"), [("item", "Calzone"), ("category", "Calzones")]
+        )
+
+    def test_invalid_limit_is_rejected(self):
+        response = self.client.get(self.typeahead_url, {"q": "piz", "limit": "many"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,95 @@
+import importlib.util
+import os
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from little_lemon.utils.cache import local_cache
+from LittleLemonAPI.models import Category, MenuItem
+
+
+class WarmCacheCommandTestCase(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.category = Category.objects.create(title="TEST", slug="test")
+        self.menu_item = MenuItem.objects.create(
+            title="Pizza", price=10.00, category=self.category, featured=True
+        )
+
+    def test_warmed_keys_are_the_keys_requests_read(self):
+        output = StringIO()
+        call_command(
+            "warm_cache",
+            pages=2,
+            concurrency=2,
+            base_url="https://api.example.com",
+            stdout=output,
+        )
+        self.assertIn("0 failed", output.getvalue())
+
+        # Drop the L1 so the requests below must find the entries in Redis
+        local_cache.clear()
+        MenuItem.objects.filter(pk=self.menu_item.pk).update(title="Not Yet Visible")
+        client = APIClient()
+        list_response = client.get(reverse("items-list"), {"featured": "true"})
+        detail_response = client.get(reverse("items-detail", args=[self.menu_item.pk]))
+        self.assertEqual(list_response.json()["results"][0]["product_name"], "Pizza")
+        self.assertEqual(detail_response.json()["product_name"], "Pizza")
+
+    def test_warmed_list_links_use_the_public_host(self):
+        MenuItem.objects.bulk_create(
+            MenuItem(title=f"Special {index}", price=9.00, category=self.category)
+            for index in range(30)
+        )
+        call_command(
+            "warm_cache", pages=2, base_url="https://api.example.com", stdout=StringIO()
+        )
+
+        local_cache.clear()
+        MenuItem.objects.update(title="Not Yet Visible")
+        response = APIClient().get(reverse("items-list"), {"limit": 25, "offset": 25})
+        self.assertNotIn("Not Yet Visible", response.content.decode())
+        self.assertTrue(
+            response.json()["previous"].startswith("https://api.example.com/api/")
+        )
+
+    def test_list_pages_are_not_warmed_without_a_base_url(self):
+        output = StringIO()
+        call_command("warm_cache", base_url="", stdout=output)
+        self.assertIn("Warmed 1 responses", output.getvalue())
+
+
+class WarmCacheOnStartTestCase(SimpleTestCase):
+    def setUp(self):
+        spec = importlib.util.spec_from_file_location(
+            "gunicorn_conf", settings.BASE_DIR / "gunicorn.conf.py"
+        )
+        self.gunicorn_conf = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.gunicorn_conf)
+
+    def start(self, **environ):
+        with patch.dict(os.environ, environ), patch.object(
+            self.gunicorn_conf.subprocess, "Popen"
+        ) as popen, patch.object(self.gunicorn_conf, "logger") as logger:
+            self.gunicorn_conf.when_ready(server=None)
+        return popen, logger
+
+    def test_missing_base_url_is_reported(self):
+        popen, logger = self.start(WARM_CACHE_ON_START="true", CACHE_WARM_BASE_URL="")
+        popen.assert_called_once()
+        logger.warning.assert_called_once()
+        self.assertIn("CACHE_WARM_BASE_URL", logger.warning.call_args.args[0])
+
+    def test_no_warning_with_a_base_url(self):
+        popen, logger = self.start(
+            WARM_CACHE_ON_START="true", CACHE_WARM_BASE_URL="https://api.example.com"
+        )
+        popen.assert_called_once()
+        logger.warning.assert_not_called()
@@ -2,15 +2,18 @@ from django.urls import include, path, re_path
 from drf_spectacular.views import (SpectacularAPIView, SpectacularRedocView,
                                    SpectacularSwaggerView)
 
-from LittleLemonAPI.views import (CartManagement, DeliveryCrewUserManagement,
+from LittleLemonAPI.views import (CacheStatsView, CartManagement,
+                                  DeliveryCrewUserManagement,
                                   ManagerUserManagement, MenuItemDetailView,
-                                  MenuItemsListView, OrderManagement)
+                                  MenuItemsListView, MenuTypeaheadView,
+                                  OrderManagement)
 
 urlpatterns = [
     re_path(r"^users/", include("djoser.urls")),
     re_path(r"^users/", include("djoser.urls.authtoken")),
     path("menu-items/", MenuItemsListView.as_view(), name="items-list"),
     path("menu-items/<int:item_id>", MenuItemDetailView.as_view(), name="items-detail"),
+    path("menu-items/typeahead", MenuTypeaheadView.as_view(), name="items-typeahead"),
     path(
         "groups/managers/user", ManagerUserManagement.as_view(), name="Management-Users"
     ),
@@ -36,6 +39,7 @@ urlpatterns = [
         OrderManagement.as_view(),
         name="Order-Detail-Management",
     ),
+    path("ops/cache", CacheStatsView.as_view(), name="Cache-Stats"),
 ]
 
 
@@ -1,8 +1,9 @@
 import json
 from datetime import datetime
 
+from django.conf import settings
 from django.contrib.auth.models import Group, User
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.forms.models import model_to_dict
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
@@ -21,9 +22,14 @@ from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
-
-from little_lemon.utils.cache import CachedResponseMixin
-from LittleLemonAPI.models import Cart, MenuItem, Order, OrderItem
+from rest_framework.throttling import ScopedRateThrottle
+
+from little_lemon.utils.cache import (CACHE_SCOPE_PUBLIC, CachedResponseMixin,
+                                      cached_view_namespaces)
+from little_lemon.utils.cache_stats import collect_namespace_stats
+from little_lemon.utils.prefix_index import ModelPrefixIndex
+from little_lemon.utils.search import FullTextSearchFilter
+from LittleLemonAPI.models import Cart, Category, MenuItem, Order, OrderItem
 from LittleLemonAPI.serializers import (CartSerializer,
                                         MenuItemDetailSerializer,
                                         MenuItemSerializer, OrderSerializer,
@@ -182,7 +188,11 @@ class MenuItemsListView(CachedResponseMixin, ListCreateAPIView):
 
     ### Filters and Search
     - **Filter by**: `featured`, `category`
-    - **Search by**: `title`
+    - **Search by**: `title`, full text with typo tolerance, most relevant first
+
+    ### Pagination
+    - `limit` and `offset` by default. Send `cursor` (empty for the first page) to page by
+      keyset instead, ordered by category, title and item id; follow `next` for later pages.
 
     ### Permissions
     - Authenticated users can view the menu items (read-only).
@@ -193,11 +203,15 @@ class MenuItemsListView(CachedResponseMixin, ListCreateAPIView):
     - **400 Bad Request**: If an item creation fails due to invalid data.
     """
 
-    queryset = MenuItem.objects.all()
+    queryset = MenuItem.objects.select_related("category")
     primary_model = MenuItem
-    cache_models = [Group, User]
+    cache_models = [Category]
+    cache_scope = CACHE_SCOPE_PUBLIC
+    cache_rendered_response = True
+    cache_fragments = True
+    keyset_ordering = ("category_id", "title", "item_id")
     serializer_class = MenuItemSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     permission_classes = [IsAuthenticatedOrReadOnly]
     filterset_fields = [
         "featured",
@@ -208,6 +222,8 @@ class MenuItemsListView(CachedResponseMixin, ListCreateAPIView):
         "contains_gluten",
     ]
     search_fields = ["title"]
+    search_vector_field = "search_vector"
+    search_trigram_field = "title"
 
     @extend_schema(
         tags=["Inventory Management"],
@@ -340,6 +356,95 @@ class MenuItemsListView(CachedResponseMixin, ListCreateAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+
+# Per-worker index behind the menu typeahead, connected to its models in the app config
+menu_typeahead_index = ModelPrefixIndex(
+    {"item": (MenuItem, "title"), "category": (Category, "title")},
+    ttl=settings.TYPEAHEAD_INDEX_TTL,
+)
+
+
+class MenuTypeaheadView(GenericAPIView):
+    """
+    Menu Typeahead API View.
+
+    Suggests menu items and categories whose title has a word starting with what was typed,
+    for search boxes that query on every keystroke. Suggestions come from an index held in
+    each worker and kept up to date as items and categories are saved, so a request does not
+    touch the database.
+
+    ### Query Parameters
+    - **q**: What was typed so far.
+    - **limit**: Maximum number of suggestions, 10 by default.
+
+    ### Permissions
+    - Anyone can read suggestions. Requests are throttled per user (or per IP address for
+      anonymous users) under the "typeahead" rate.
+
+    Raises:
+    - **400 Bad Request**: If `limit` is not a positive integer.
+    - **429 Too Many Requests**: If the typeahead rate is exceeded.
+    """
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "typeahead"
+    serializer_class = inline_serializer(name="Menu Typeahead", fields={})
+
+    @extend_schema(
+        tags=["Inventory Management"],
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                description="What was typed so far.",
+                required=True,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="limit",
+                description="Maximum number of suggestions.",
+                required=False,
+                type=int,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                description="Suggestions, titles starting with the query first.",
+                examples=[
+                    OpenApiExample(
+                        name="Suggestions",
+                        value={
+                            "results": [
+                                {"type": "item", "id": 4, "title": "Pizza Margherita"},
+                                {"type": "category", "id": 2, "title": "Pizzas"},
+                            ]
+                        },
+                    )
+                ],
+            ),
+            400: OpenApiResponse(
+                response={"error": '"limit" must be a positive integer.'},
+                description="The limit is invalid.",
+            ),
+        },
+    )
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", 10))
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {"error": '"limit" must be a positive integer.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        results = menu_typeahead_index.search(
+            request.query_params.get("q", ""),
+            limit=min(limit, settings.TYPEAHEAD_MAX_RESULTS),
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
 class MenuItemDetailView(CachedResponseMixin, RetrieveUpdateDestroyAPIView):
     """
     Menu Item Detail, Update, and Delete API View.
@@ -358,9 +463,13 @@ class MenuItemDetailView(CachedResponseMixin, RetrieveUpdateDestroyAPIView):
     """
 
     serializer_class = MenuItemDetailSerializer
-    queryset = MenuItem.objects.all()
+    queryset = MenuItem.objects.select_related("category")
     primary_model = MenuItem
-    cache_models = [Group, User]
+    cache_models = [Category]
+    cache_scope = CACHE_SCOPE_PUBLIC
+    cache_rendered_response = True
+    cache_per_row = True
+    cache_ttl_jitter = 0.2  # Every detail entry is written at once by warm_cache
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = "item_id"
 
@@ -1019,6 +1128,10 @@ class OrderManagement(
     - **Filter by**: `status`, `date`, `delivery_crew`, `user`
     - **Search by**: `order_id`, `user`
 
+    ### Pagination
+    - `limit` and `offset` by default. Send `cursor` (empty for the first page) to page by
+      keyset instead, ordered by date and id; follow `next` for later pages.
+
     ### Permissions
     - Only authenticated users can access order operations.
     - Managers can view all orders and perform all actions.
@@ -1035,11 +1148,19 @@ class OrderManagement(
     queryset = Order.objects.all()
     cache_models = [MenuItem, Group, User, Cart, OrderItem]
     primary_model = Order
+    keyset_ordering = ("date", "id")
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ["status", "date", "delivery_crew", "user"]
     search_fields = ["order_id", "user"]
+    lookup_url_kwarg = "order_id"
+
+    def get(self, request, *args, **kwargs):
+        # orders/<order_id> retrieves a single order, orders lists them
+        if self.lookup_url_kwarg in kwargs:
+            return self.retrieve(request, *args, **kwargs)
+        return self.list(request, *args, **kwargs)
 
     @extend_schema(
         tags=["Order Management"],
@@ -1128,18 +1249,102 @@ class OrderManagement(
                 {"error": "No items in cart."}, status=status.HTTP_400_BAD_REQUEST
             )
         total = sum(cart.price for cart in carts)
-        new_order = Order.objects.create(user=request.user, total=total)
-        for cart in carts:
-            OrderItem.objects.create(
-                order=new_order,
-                menuitem=cart.menuitem,
-                quantity=cart.quantity,
-                unit_price=cart.unit_price,
-                price=cart.price,
-            )
-            cart.delete()
+        # One transaction, so the cached views are invalidated once the order is complete
+        with transaction.atomic():
+            new_order = Order.objects.create(user=request.user, total=total)
+            for cart in carts:
+                OrderItem.objects.create(
+                    order=new_order,
+                    menuitem=cart.menuitem,
+                    quantity=cart.quantity,
+                    unit_price=cart.unit_price,
+                    price=cart.price,
+                )
+                cart.delete()
 
         return Response(
             {"response": f"Order {new_order.order_id} created."},
             status=status.HTTP_201_CREATED,
         )
+
+
+class CacheStatsView(GenericAPIView):
+    """
+    Cache Statistics API View.
+
+    Reports, for every cached view namespace, the number of Redis keys it holds, the memory
+    they use, the sampled hit ratio and the most read keys. Each call also refreshes the
+    matching `cached_queryset_namespace_*` Prometheus gauges.
+
+    ### Permissions
+    - Only users in the "manager" group can view cache statistics.
+
+    Raises:
+    - **400 Bad Request**: If `top` is not a positive integer.
+    - **403 Forbidden**: If a non-manager requests the statistics.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = inline_serializer(name="Cache Stats", fields={})
+
+    @extend_schema(
+        tags=["Operations"],
+        parameters=[
+            OpenApiParameter(
+                name="top",
+                description="Number of hot keys reported per namespace, 10 by default and at most 100.",
+                required=False,
+                type=int,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                description="Statistics for every cached view namespace.",
+                examples=[
+                    OpenApiExample(
+                        name="Cache Stats",
+                        value=[
+                            {
+                                "namespace": "MenuItem:MenuItemsListView",
+                                "keys": 42,
+                                "bytes": 183204,
+                                "hit_ratio": 0.94,
+                                "estimated_reads": 51200,
+                                "hot_keys": [
+                                    {
+                                        "key": "{MenuItem:MenuItemsListView}:g3:MenuItem_Category_json_public_5f1e..._cache_key",
+                                        "estimated_reads": 20400,
+                                    }
+                                ],
+                            }
+                        ],
+                    )
+                ],
+            ),
+            403: OpenApiResponse(
+                response={"error": "Action restricted to managers only."},
+                description="Non-managers cannot perform this action.",
+            ),
+        },
+    )
+    def get(self, request):
+        if not request.user.groups.filter(name="manager").exists():
+            logger.warning(f"Unauthorized GET Request Blocked At {request.path}")
+            return Response(
+                {"error": "Action restricted to managers only."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        try:
+            top_n = int(request.query_params.get("top", 10))
+            if top_n < 1:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {"error": '"top" must be a positive integer.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        stats = collect_namespace_stats(
+            cached_view_namespaces(),
+            top_n=min(top_n, settings.VIEW_CACHE_STATS_MAX_TOP),
+        )
+        return Response(stats, status=status.HTTP_200_OK)
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+from loguru import logger
+
+
+def on_starting(server):
+    """Export the thread count, so each worker sizes its Redis connection pool to match."""
+    os.environ["GUNICORN_THREADS"] = str(server.cfg.threads)
+
+
+# Set WARM_CACHE_ON_START=true to warm the cache on start. Menu list pages are only warmed
+# when CACHE_WARM_BASE_URL is set to the public URL of the API, e.g.
+# "https://api.example.com", because their pagination links are built from it.
+def when_ready(server):
+    """Warm the view cache in the background once the workers are ready to serve."""
+    if os.getenv("WARM_CACHE_ON_START", "false").lower() not in ("1", "true", "yes"):
+        return
+    if not os.getenv("CACHE_WARM_BASE_URL"):
+        logger.warning(
+            "CACHE_WARM_BASE_URL is not set, only menu item details will be warmed"
+        )
+    logger.info("Warming the view cache")
+    subprocess.Popen(
+        [sys.executable, "manage.py", "warm_cache"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
@@ -10,6 +10,8 @@ from loguru import logger
 from redis.backoff import ExponentialBackoff
 from redis.retry import Retry
 
+from little_lemon.utils.cache_pool import pool_size_for_threads
+
 
 def log_warning(message, category, filename, lineno, file=None, line=None):
     logger.warning(f" {message}")
@@ -53,6 +55,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "whitenoise.runserver_nostatic",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "cachalot",
     "drf_redesign",
     "dynamic_breadcrumbs",
@@ -68,7 +71,6 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django_prometheus.middleware.PrometheusBeforeMiddleware",
-    "django.middleware.cache.UpdateCacheMiddleware",
     "django.middleware.security.SecurityMiddleware",
     # "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -77,7 +79,6 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "django.middleware.cache.FetchFromCacheMiddleware",
     "django_prometheus.middleware.PrometheusAfterMiddleware",
 ]
 
@@ -126,8 +127,12 @@ REST_FRAMEWORK = {
         "rest_framework.throttling.UserRateThrottle",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_THROTTLE_RATES": {"anon": "4/minute", "user": "12/minute"},
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "4/minute",
+        "user": "12/minute",
+        "typeahead": "300/minute",  # One request per keystroke in the POS search box
+    },
+    "DEFAULT_PAGINATION_CLASS": "little_lemon.utils.pagination.KeysetPagination",
     "PAGE_SIZE": 25,
 }
 
@@ -183,20 +188,42 @@ DATABASES = {
     }
 }
 
+# Request threads per gunicorn worker, exported by gunicorn.conf.py. Each worker has its own
+# connection pool (per shard), sized to its threads unless CACHE_POOL_MAX_CONNECTIONS is set.
+WORKER_THREADS = int(os.getenv("GUNICORN_THREADS", 1))
+CACHE_POOL_MAX_CONNECTIONS = int(
+    os.getenv("CACHE_POOL_MAX_CONNECTIONS", pool_size_for_threads(WORKER_THREADS))
+)
+
+# Comma separated URLs of the Redis/Dragonfly nodes to shard the cache over, if more than one
+CACHE_SHARDS = [url for url in os.getenv("CACHE_SHARDS", "").split(",") if url]
+
 CACHES = {
     "default": {
         "BACKEND": "django_prometheus.cache.backends.redis.RedisCache",
-        "LOCATION": f"redis://{os.getenv('CACHE_USER')}:{os.getenv('CACHE_PASSWORD')}@{os.getenv('CACHE_HOST')}:{os.getenv('CACHE_PORT')}/{os.getenv('CACHE_DB')}",
+        "LOCATION": CACHE_SHARDS or f"redis://{os.getenv('CACHE_USER')}:{os.getenv('CACHE_PASSWORD')}@{os.getenv('CACHE_HOST')}:{os.getenv('CACHE_PORT')}/{os.getenv('CACHE_DB')}",
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
-            "CONNECTION_POOL_CLASS": "redis.BlockingConnectionPool",  # Optional, but recommended
+            "CLIENT_CLASS": (
+                "little_lemon.utils.cache_shard.ShardedClient"  # Consistent hashing over CACHE_SHARDS
+                if CACHE_SHARDS
+                else "little_lemon.utils.cache_codec.InstrumentedClient"
+            ),
+            "SERIALIZER": "little_lemon.utils.cache_codec.MsgpackSerializer",
+            "COMPRESSOR": "little_lemon.utils.cache_codec.ThresholdCompressor",
+            "COMPRESS_MIN_BYTES": 1024,  # Smaller values are stored uncompressed
+            "COMPRESS_ENCODING": os.getenv("CACHE_COMPRESSION", "gzip"),
+            "CONNECTION_POOL_CLASS": "little_lemon.utils.cache_pool.InstrumentedBlockingConnectionPool",
             "CONNECTION_POOL_CLASS_KWARGS": {
-                "max_connections": 15,  # Customize as needed
-                "timeout": 200,  # Customize as needed
+                "max_connections": CACHE_POOL_MAX_CONNECTIONS,
+                "timeout": float(os.getenv("CACHE_POOL_TIMEOUT", 0.5)),  # Seconds to wait for a free connection
+                "wait_warning_threshold": float(os.getenv("CACHE_POOL_WAIT_WARNING", 0.05)),  # Log checkouts slower than this
             },
+            # A cache call must give up well before the database would have answered
+            "SOCKET_CONNECT_TIMEOUT": float(os.getenv("CACHE_SOCKET_CONNECT_TIMEOUT", 0.5)),
+            "SOCKET_TIMEOUT": float(os.getenv("CACHE_SOCKET_TIMEOUT", 0.5)),
             "RETRY_ON_TIMEOUT": True,  # Enable retries on timeouts
             "RETRY": Retry(  # Configure retry strategy
-                backoff=ExponentialBackoff(base=0.1, cap=15), retries=5
+                backoff=ExponentialBackoff(base=0.05, cap=0.2), retries=2
             ),
         },
     }
@@ -205,6 +232,53 @@ CACHES = {
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 VIEW_CACHE_TTL = int(os.environ["CACHE_TTL"])
+# Seconds a stale entry may be served while it is rebuilt
+VIEW_CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", 30))
+# Seconds a serialized list item is kept, changes invalidate it sooner
+VIEW_CACHE_FRAGMENT_TTL = int(os.getenv("CACHE_FRAGMENT_TTL", 3600))
+# Seconds a 404 for a missing detail lookup is cached
+VIEW_CACHE_NEGATIVE_TTL = int(os.getenv("CACHE_NEGATIVE_TTL", 30))
+# Fraction of the TTL entries are randomly shortened or lengthened by
+VIEW_CACHE_TTL_JITTER = float(os.getenv("CACHE_TTL_JITTER", 0.1))
+# > 1 favours recomputing earlier, 0 disables early recomputation
+VIEW_CACHE_XFETCH_BETA = float(os.getenv("CACHE_XFETCH_BETA", 1.0))
+VIEW_CACHE_LOCK_TIMEOUT = 10  # Seconds before an abandoned rebuild lock expires
+VIEW_CACHE_LOCK_WAIT = 2  # Seconds a miss waits on another worker's rebuild
+# Consecutive Redis failures before the cache is bypassed
+VIEW_CACHE_BREAKER_FAILURE_THRESHOLD = int(
+    os.getenv("CACHE_BREAKER_FAILURE_THRESHOLD", 5)
+)
+# Seconds before a bypassed cache is probed again
+VIEW_CACHE_BREAKER_RECOVERY_TIMEOUT = float(
+    os.getenv("CACHE_BREAKER_RECOVERY_TIMEOUT", 30)
+)
+# Per-worker in-process entries
+VIEW_CACHE_L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", 1024))
+# Upper bound on L1 staleness if an invalidation message is missed
+VIEW_CACHE_L1_TTL = int(os.getenv("CACHE_L1_TTL", 10))
+VIEW_CACHE_INVALIDATION_CHANNEL = "little_lemon:cache-invalidation"
+# Public URL of the API that warm_cache builds list page links from,
+# e.g. "https://api.example.com"
+VIEW_CACHE_WARM_BASE_URL = os.getenv("CACHE_WARM_BASE_URL", "")
+# Seconds before the per-worker typeahead index is reloaded from the database
+TYPEAHEAD_INDEX_TTL = int(os.getenv("TYPEAHEAD_INDEX_TTL", 300))
+TYPEAHEAD_MAX_RESULTS = 25  # Upper bound on the typeahead "limit" parameter
+# "zstd" (needs zstandard), "gzip" or "" to disable
+VIEW_CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "gzip")
+# Rendered bodies smaller than this are stored uncompressed
+VIEW_CACHE_COMPRESS_MIN_BYTES = 1024
+# Share of cache reads recorded for hot-key detection
+VIEW_CACHE_STATS_SAMPLE_RATE = float(os.getenv("CACHE_STATS_SAMPLE_RATE", 0.01))
+# Seconds sampled read counts are kept without further reads
+VIEW_CACHE_STATS_WINDOW = 86400
+VIEW_CACHE_STATS_MAX_HOT_KEYS = 1000  # Most read keys tracked per namespace
+VIEW_CACHE_STATS_MAX_TOP = 100  # Upper bound on the hot keys reported per namespace
+# Entry and byte budgets per cached view namespace, enforced with LRU eviction on write.
+# Per-user namespaces with unbounded filter combinations are capped so they cannot crowd
+# the shared menu entries out of Redis. Namespaces not listed here are unlimited.
+VIEW_CACHE_NAMESPACE_BUDGETS = {
+    "Order:OrderManagement": {"max_entries": 5000, "max_bytes": 16 * 1024 * 1024},
+}
 
 
 # Password validation
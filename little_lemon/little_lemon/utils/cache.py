@@ -1,16 +1,45 @@
 import hashlib
-from typing import Union
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Iterable, Iterator, List, Optional, Union
 
 from django.conf import settings
 from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.db.models import Model
 from django.db.models.signals import post_delete, post_save
-from django.dispatch import receiver
+from django.forms import ModelChoiceField
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, urlencode
+from django_filters.rest_framework import DjangoFilterBackend
 from loguru import logger
 from prometheus_client import Counter
 from redis.exceptions import LockNotOwnedError
 from rest_framework import status
+from rest_framework.filters import SearchFilter
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
+from little_lemon.utils import compression
+from little_lemon.utils.cache_breaker import (BREAKER_OPEN,
+                                              CACHE_UNAVAILABLE_ERRORS,
+                                              CircuitBreaker)
+from little_lemon.utils.cache_budget import (enforce_namespace_budget,
+                                             touch_namespace_entry)
+from little_lemon.utils.cache_shard import hash_tag
+from little_lemon.utils.cache_stats import record_access
+from little_lemon.utils.local_cache import LocalLRUCache
+from little_lemon.utils.pagination import KeysetPagination
+
 cached_queryset_hit = Counter(
     "cached_queryset_hit", "Number of requests served by a cached Queryset", ["model"]
 )
@@ -22,6 +51,401 @@ cached_queryset_miss = Counter(
 cached_queryset_evicted = Counter(
     "cached_queryset_evicted", "Number of cached Querysets evicted", ["model"]
 )
+cached_queryset_l1_hit = Counter(
+    "cached_queryset_l1_hit",
+    "Number of requests served by the in-process (L1) cache",
+    ["model"],
+)
+cached_queryset_l2_hit = Counter(
+    "cached_queryset_l2_hit",
+    "Number of requests served by the Redis (L2) cache",
+    ["model"],
+)
+cached_queryset_query_normalized = Counter(
+    "cached_queryset_query_normalized",
+    "Number of cache keys whose query string was rewritten (or left unchanged) by normalization",
+    ["model", "outcome"],
+)
+cached_queryset_stale_served = Counter(
+    "cached_queryset_stale_served",
+    "Number of requests served a stale cached Queryset while another worker rebuilt it",
+    ["model"],
+)
+cached_queryset_coalesced = Counter(
+    "cached_queryset_coalesced",
+    "Number of cache misses that waited for another worker's rebuild instead of querying",
+    ["model"],
+)
+cached_queryset_lock_timeout = Counter(
+    "cached_queryset_lock_timeout",
+    "Number of cache misses that gave up waiting on another worker's rebuild",
+    ["model"],
+)
+cached_queryset_early_recompute = Counter(
+    "cached_queryset_early_recompute",
+    "Number of fresh cache entries recomputed ahead of their expiry",
+    ["model"],
+)
+cached_queryset_fragment_hit = Counter(
+    "cached_queryset_fragment_hit",
+    "Number of list items served from a cached serialized fragment",
+    ["model"],
+)
+cached_queryset_fragment_miss = Counter(
+    "cached_queryset_fragment_miss",
+    "Number of list items serialized because their fragment was not cached",
+    ["model"],
+)
+cached_queryset_bypassed = Counter(
+    "cached_queryset_bypassed",
+    "Number of requests served without the cache because Redis was unavailable",
+    ["model"],
+)
+
+
+# Who a cached response is shared between
+CACHE_SCOPE_PUBLIC = "public"  # Every user, the response does not depend on who asks
+CACHE_SCOPE_ROLE = "role"  # Users with the same set of groups
+CACHE_SCOPE_USER = "user"  # A single user
+
+# Maps each model to the namespaces of the cached views that depend on it
+cache_dependency_registry: dict[type[Model], set[str]] = defaultdict(set)
+
+# Models whose rows each get their own namespace, for views caching one entry or fragment
+# per row
+row_cache_registry: set[type[Model]] = set()
+
+# Models whose row namespaces are published although no cached view reads them, for the
+# in-process indexes that follow their rows through the invalidation channel
+published_row_models: set[type[Model]] = set()
+
+# Called with the namespaces of every invalidation message, or with None when messages may
+# have been missed
+invalidation_handlers: list[Callable[[Optional[list[str]]], None]] = []
+
+# Per-worker L1 in front of Redis, kept coherent through the invalidation channel
+local_cache = LocalLRUCache(
+    max_entries=settings.VIEW_CACHE_L1_MAX_ENTRIES, ttl=settings.VIEW_CACHE_L1_TTL
+)
+_invalidation_listener_pid = None
+_invalidation_listener_lock = threading.Lock()
+
+# Every cache call of the views and of invalidation goes through this breaker
+cache_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.VIEW_CACHE_BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout=settings.VIEW_CACHE_BREAKER_RECOVERY_TIMEOUT,
+)
+# Namespaces whose invalidation could not reach Redis, bumped once it answers again
+_deferred_invalidations: set[str] = set()
+_deferred_invalidations_lock = threading.Lock()
+
+
+def notify_invalidation_handlers(namespaces: Optional[list[str]]) -> None:
+    """Pass an invalidation to the `invalidation_handlers`, isolating their failures."""
+    for handler in invalidation_handlers:
+        try:
+            handler(namespaces)
+        except Exception as e:
+            logger.error(f"Invalidation handler {handler} failed: {e}")
+
+
+def evict_local_namespaces(namespaces: Iterable[str]) -> None:
+    """Drop the L1 entries and generations of the given namespaces in this worker.
+
+    The namespaces are also passed to the `invalidation_handlers`, whether the invalidation
+    comes from this worker or from the channel.
+    """
+    namespaces = list(namespaces)
+    for namespace in namespaces:
+        local_cache.delete_prefix(f"{hash_tag(namespace)}:")
+    notify_invalidation_handlers(namespaces)
+
+
+def handle_invalidation_message(message: dict) -> None:
+    """Apply an invalidation published by any worker to this worker's L1."""
+    namespaces = json.loads(message["data"])
+    logger.debug(f"Invalidation message received for {namespaces}")
+    # Handlers may query the database from this thread, whose connection can go stale
+    close_old_connections()
+    evict_local_namespaces(namespaces)
+
+
+def handle_invalidation_listener_error(error, pubsub, thread) -> None:
+    """Keep the listener alive across Redis errors.
+
+    Messages may have been missed while disconnected, so the whole L1 is dropped.
+    """
+    logger.error(f"Cache invalidation listener error: {error}")
+    local_cache.clear()
+    notify_invalidation_handlers(None)
+    time.sleep(1)
+
+
+def ensure_invalidation_listener() -> bool:
+    """Start this worker's invalidation subscriber if it is not running yet.
+
+    The subscriber runs in a daemon thread. It is started lazily, and again after a
+    fork, so every gunicorn worker has its own. While `cache_breaker` is open no attempt
+    is made, so requests do not pile up on subscriptions to an unavailable Redis.
+
+    Returns:
+        bool: Whether the listener is running. The L1 is bypassed while it is not.
+    """
+    global _invalidation_listener_pid
+    if _invalidation_listener_pid == os.getpid():
+        return True
+    if cache_breaker.state == BREAKER_OPEN:
+        return False
+    with _invalidation_listener_lock:
+        if _invalidation_listener_pid == os.getpid():
+            return True
+        try:
+            channel = settings.VIEW_CACHE_INVALIDATION_CHANNEL
+            pubsub = cache.client.get_client_for_key(channel, write=False).pubsub(
+                ignore_subscribe_messages=True
+            )
+            pubsub.subscribe(
+                **{
+                    settings.VIEW_CACHE_INVALIDATION_CHANNEL: handle_invalidation_message
+                }
+            )
+            pubsub.run_in_thread(
+                sleep_time=1,
+                daemon=True,
+                exception_handler=handle_invalidation_listener_error,
+            )
+        except Exception as e:
+            logger.error(f"Unable to start cache invalidation listener: {e}")
+            return False
+        local_cache.clear()
+        notify_invalidation_handlers(None)
+        _invalidation_listener_pid = os.getpid()
+        return True
+
+
+def namespace_generation_key(namespace: str) -> str:
+    """Return the cache key holding the generation counter of a namespace.
+
+    Every key of a namespace starts with its hash tag, so they all live on the same shard.
+    """
+    return f"{hash_tag(namespace)}:generation"
+
+
+def row_namespace(model: type[Model], pk) -> str:
+    """Return the namespace of a single row, e.g. "MenuItem:pk:42"."""
+    return f"{model.__name__}:pk:{pk}"
+
+
+def get_namespace_generation(namespace: str) -> int:
+    """Return the current generation of a cache namespace.
+
+    A namespace that has never been invalidated has no counter yet and is
+    reported as generation 0.
+
+    The generation is kept in the L1 so that a request served from the L1 needs no round
+    trip to Redis at all.
+
+    Args:
+        namespace (str): The cache namespace of a view, e.g. "MenuItem:MenuItemsListView".
+
+    Returns:
+        int: The current generation of the namespace.
+    """
+    return get_namespace_generations([namespace])[namespace]
+
+
+def get_namespace_generations(namespaces: Iterable[str]) -> dict[str, int]:
+    """Return the current generations of several namespaces in at most one round trip.
+
+    Args:
+        namespaces (Iterable[str]): The cache namespaces to look up.
+
+    Returns:
+        dict[str, int]: The current generation of each namespace.
+    """
+    generation_keys = {namespace_generation_key(ns): ns for ns in namespaces}
+    use_local_cache = ensure_invalidation_listener()
+    generations = {}
+    if use_local_cache:
+        for generation_key, namespace in generation_keys.items():
+            if (generation := local_cache.get(generation_key)) is not None:
+                generations[namespace] = generation
+    missing_keys = [key for key, ns in generation_keys.items() if ns not in generations]
+    if missing_keys:
+        stored = cache.get_many(missing_keys)
+        for generation_key in missing_keys:
+            generation = stored.get(generation_key) or 0
+            generations[generation_keys[generation_key]] = generation
+            if use_local_cache:
+                local_cache.set(generation_key, generation)
+    return generations
+
+
+def bump_namespace_generations(namespaces: Iterable[str]) -> dict[str, int]:
+    """Invalidate every entry of the given namespaces by incrementing their generations.
+
+    Cache keys embed the generation they were written under, so after the
+    increment no reader will build the old keys again and the stale entries
+    simply age out through their TTL. All counters are incremented in a single
+    pipelined round trip per shard, no matter how many keys the namespaces hold. The same
+    round trip publishes the namespaces so every worker drops them from its L1.
+
+    Args:
+        namespaces (Iterable[str]): The cache namespaces to invalidate.
+
+    Returns:
+        dict[str, int]: The new generation of each namespace.
+    """
+    namespaces = sorted(set(namespaces))
+    if not namespaces:
+        return {}
+    evict_local_namespaces(namespaces)
+    pipelines = {}
+
+    def pipeline_for(key: str):
+        client = cache.client.get_client_for_key(key)
+        if id(client) not in pipelines:
+            pipelines[id(client)] = client.pipeline(transaction=False)
+        return pipelines[id(client)]
+
+    positions = {}
+    for namespace in namespaces:
+        generation_key = cache.client.make_key(namespace_generation_key(namespace))
+        pipeline = pipeline_for(generation_key)
+        pipeline.incr(generation_key)
+        positions[namespace] = (id(pipeline), len(pipeline) - 1)
+    channel = settings.VIEW_CACHE_INVALIDATION_CHANNEL
+    pipeline_for(channel).publish(channel, json.dumps(namespaces))
+    results = {id(pipeline): pipeline.execute() for pipeline in pipelines.values()}
+    return {
+        namespace: results[pipeline_id][index]
+        for namespace, (pipeline_id, index) in positions.items()
+    }
+
+
+def defer_invalidation(namespaces: Iterable[str]) -> None:
+    """Remember namespaces whose generation could not be bumped while Redis was unavailable.
+
+    Their L1 entries are dropped right away. The generations are bumped by
+    `bump_deferred_invalidations` before this worker uses the cache again.
+
+    Args:
+        namespaces (Iterable[str]): The cache namespaces to invalidate.
+    """
+    namespaces = set(namespaces)
+    evict_local_namespaces(namespaces)
+    with _deferred_invalidations_lock:
+        _deferred_invalidations.update(namespaces)
+
+
+def bump_deferred_invalidations() -> None:
+    """Bump the generations of the namespaces whose invalidation was deferred.
+
+    Raises:
+        ConnectionInterrupted, ConnectionError, TimeoutError: If Redis is still unavailable.
+            The namespaces are deferred again.
+    """
+    with _deferred_invalidations_lock:
+        namespaces = set(_deferred_invalidations)
+        _deferred_invalidations.clear()
+    if not namespaces:
+        return
+    try:
+        generations = bump_namespace_generations(namespaces)
+    except CACHE_UNAVAILABLE_ERRORS:
+        defer_invalidation(namespaces)
+        raise
+    logger.info(f"Deferred cache invalidation applied: {generations}")
+
+
+def iter_cached_views() -> Iterator[type["CachedResponseMixin"]]:
+    """Yield every CachedResponseMixin subclass that caches, i.e. has a `primary_model`."""
+    pending = list(CachedResponseMixin.__subclasses__())
+    while pending:
+        view_class = pending.pop()
+        pending.extend(view_class.__subclasses__())
+        if getattr(view_class, "primary_model", None) is not None:
+            yield view_class
+
+
+def cached_view_namespaces() -> list[str]:
+    """Return the namespaces of every cached view, sorted."""
+    return sorted({view.get_cache_namespace() for view in iter_cached_views()})
+
+
+def build_cache_dependency_registry() -> dict[type[Model], set[str]]:
+    """Populate the dependency registry from every CachedResponseMixin subclass.
+
+    Each view depends on its `primary_model` and on every model listed in its
+    `cache_models`. Views without a `primary_model` never cache anything and are
+    skipped. This must run once the views module has been imported.
+
+    Views with `cache_per_row = True` do not depend on their `primary_model` as a whole.
+    Their model is added to `row_cache_registry` instead, so a change to one row only
+    invalidates that row's namespace. Views with `cache_fragments = True` register their
+    model the same way, and their fragment namespace depends on their `cache_models` only.
+    Models in `published_row_models` get row namespaces as well.
+
+    The invalidation receiver is connected only to the registered models, so saves of
+    anything else (tokens, sessions, ...) never reach it.
+
+    Returns:
+        dict[type[Model], set[str]]: The populated registry.
+
+    Raises:
+        ImproperlyConfigured: If a per-row view does not look its rows up by primary key.
+    """
+    for model in {*cache_dependency_registry, *row_cache_registry}:
+        post_save.disconnect(sender=model, dispatch_uid="invalidate_cache")
+        post_delete.disconnect(sender=model, dispatch_uid="invalidate_cache")
+    cache_dependency_registry.clear()
+    row_cache_registry.clear()
+    for view_class in iter_cached_views():
+        primary_model = view_class.primary_model
+        namespace = view_class.get_cache_namespace()
+        dependencies = [*getattr(view_class, "cache_models", [])]
+        if view_class.cache_per_row:
+            if view_class.lookup_field not in ("pk", primary_model._meta.pk.name):
+                raise ImproperlyConfigured(
+                    f"{view_class.__name__} caches per row but does not look up by primary key."
+                )
+            row_cache_registry.add(primary_model)
+        else:
+            dependencies.insert(0, primary_model)
+        for model in dependencies:
+            if model is not None:
+                cache_dependency_registry[model].add(namespace)
+        if view_class.cache_fragments:
+            row_cache_registry.add(primary_model)
+            for model in getattr(view_class, "cache_models", []):
+                if model is not None:
+                    cache_dependency_registry[model].add(
+                        view_class.get_cache_fragment_namespace()
+                    )
+    row_cache_registry.update(published_row_models)
+    for model in {*cache_dependency_registry, *row_cache_registry}:
+        post_save.connect(
+            invalidate_cache, sender=model, dispatch_uid="invalidate_cache"
+        )
+        post_delete.connect(
+            invalidate_cache, sender=model, dispatch_uid="invalidate_cache"
+        )
+    logger.debug(f"Cache dependency registry built: {dict(cache_dependency_registry)}")
+    return cache_dependency_registry
+
+
+def is_servable_stale(entry: Optional[dict]) -> bool:
+    """Return whether an entry past its freshness may still be served during a rebuild.
+
+    Args:
+        entry (dict or None): The cache entry, if any.
+
+    Returns:
+        bool: True for stale entries of successful responses, False for a miss or a
+        negative entry.
+    """
+    return entry is not None and entry["status"] != status.HTTP_404_NOT_FOUND
 
 
 class CachedResponseMixin:
@@ -29,13 +453,200 @@ class CachedResponseMixin:
 
     This mixin allows views to cache their responses based on user identity and query parameters,
     improving performance by reducing the need for repeated database queries.
+
+    Every view caches under its own namespace. Saving or deleting the view's `primary_model`
+    or any model in its `cache_models` invalidates that namespace.
+
+    Views that set `cache_rendered_response = True` cache the final rendered body, compressed
+    with `VIEW_CACHE_COMPRESSION` once it exceeds `VIEW_CACHE_COMPRESS_MIN_BYTES`, so a hit
+    skips serialization and rendering entirely. Only JSON bodies are cached: other renderers,
+    such as the browsable API, embed the requesting user and a CSRF token, so those requests
+    bypass the cache. Other views cache the response data.
+
+    Every entry records a hash of its content and the time it was built. Responses served
+    from an entry carry them as a strong `ETag` and `Last-Modified`, and a conditional GET
+    matching them is answered with a 304 straight from the cache.
+
+    `cache_scope` declares who an entry is shared between: `CACHE_SCOPE_PUBLIC` for
+    responses that do not depend on the user, `CACHE_SCOPE_ROLE` for responses that only
+    depend on the user's groups, and `CACHE_SCOPE_USER` (the default) for private data.
+
+    Detail views that set `cache_per_row = True` also embed the generation of the requested
+    row's namespace in their keys. Saving or deleting that row then only invalidates its own
+    detail entries, while the view's namespace is left to its `cache_models`.
+
+    Entries written together must not expire together. Their TTL is randomly shortened or
+    lengthened by up to `cache_ttl_jitter` (a fraction, `VIEW_CACHE_TTL_JITTER` by default),
+    and each entry records how long it took to compute so that a request may recompute it
+    ahead of its expiry (XFetch), with a probability rising as the expiry nears.
+
+    List views that set `cache_fragments = True` also cache each serialized item on its own,
+    keyed by the generation of the item's row namespace. Rebuilding a list entry then only
+    queries the page's primary keys and serializes the items whose fragment is missing, so a
+    change to one item costs one fragment instead of every page. Fragments are shared by
+    every scope, so the serializer output must not depend on the requesting user.
+
+    List responses are built from `.values()` rows when the serializer has a read-only fast
+    path, i.e. a `values_fields` tuple and a `represent_values(row)` classmethod.
     """
 
-    def get_cache_key(self) -> str:
+    cache_rendered_response = False
+    cache_scope = CACHE_SCOPE_USER
+    cache_per_row = False
+    cache_fragments = False
+    cache_ttl_jitter: Optional[float] = None
+
+    @classmethod
+    def get_cache_namespace(cls) -> str:
+        """Return the namespace this view's cache entries are written under.
+
+        Returns:
+            str: The namespace, e.g. "MenuItem:MenuItemsListView".
+
+        Raises:
+            AttributeError: If the view does not have a 'primary_model' attribute.
+        """
+        primary_model = getattr(cls, "primary_model", None)
+        if not primary_model:
+            raise AttributeError("View must have a 'primary_model' attribute.")
+        return f"{primary_model.__name__}:{cls.__name__}"
+
+    @classmethod
+    def get_cache_fragment_namespace(cls) -> str:
+        """Return the namespace this view's item fragments are written under.
+
+        Returns:
+            str: The namespace, e.g. "MenuItem:MenuItemsListView:fragments".
+        """
+        return f"{cls.get_cache_namespace()}:fragments"
+
+    def get_cache_scope_key(self) -> str:
+        """Return the part of the cache key that identifies who may share the entry.
+
+        Returns:
+            str: "public", a hash of the user's group names, or the user ID.
+
+        Raises:
+            ValueError: If the view declares an unknown `cache_scope`.
+        """
+        user = self.request.user
+        if self.cache_scope == CACHE_SCOPE_PUBLIC:
+            return "public"
+        if not user.is_authenticated:
+            return "anon"
+        if self.cache_scope == CACHE_SCOPE_ROLE:
+            groups = ",".join(sorted(user.groups.values_list("name", flat=True)))
+            return f"role-{hashlib.md5(groups.encode('utf-8')).hexdigest()}"
+        if self.cache_scope == CACHE_SCOPE_USER:
+            return str(user.id)
+        raise ValueError(f"Unknown cache scope: {self.cache_scope}")
+
+    def get_canonical_query_params(self) -> str:
+        """Return the query string reduced to what the view's backends actually consume.
+
+        Filterset parameters are coerced to their Python values, search terms are kept in
+        their order with whitespace collapsed (and lowercased when every search field is
+        case-insensitive), and pagination parameters are replaced by the effective
+        limit and offset (or limit and re-encoded cursor, for keyset pages) on list requests.
+        Anything else is dropped, so equivalent requests share a key.
+
+        Returns:
+            str: The canonical, sorted query string.
+        """
+        params = {}
+        for backend_class in getattr(self, "filter_backends", None) or []:
+            backend = backend_class()
+            if isinstance(backend, DjangoFilterBackend):
+                filterset_class = backend.get_filterset_class(self, self.queryset)
+                if filterset_class is not None:
+                    params.update(self._canonical_filterset_params(filterset_class))
+            elif isinstance(backend, SearchFilter):
+                terms = backend.get_search_terms(self.request)
+                if not any(field[0] in "^=@$" for field in self.search_fields):
+                    terms = [term.lower() for term in terms]
+                # Ranking may depend on the order and repetition of the terms
+                if terms:
+                    params[backend.search_param] = " ".join(terms)
+
+        # Detail lookups are not paginated, so limit and offset must not split their entries
+        paginator = self.paginator
+        is_detail = (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+        if isinstance(paginator, LimitOffsetPagination) and not is_detail:
+            params[paginator.limit_query_param] = paginator.get_limit(self.request)
+            if isinstance(paginator, KeysetPagination) and paginator.is_keyset_request(
+                self.request, self
+            ):
+                params[paginator.cursor_query_param] = paginator.get_canonical_cursor(
+                    self.request, self
+                )
+            else:
+                params[paginator.offset_query_param] = paginator.get_offset(
+                    self.request
+                )
+
+        canonical = urlencode(sorted(params.items()))
+        outcome = (
+            "unchanged" if canonical == self.request.GET.urlencode() else "rewritten"
+        )
+        cached_queryset_query_normalized.labels(
+            model=self.primary_model.__name__, outcome=outcome
+        ).inc()
+        return canonical
+
+    def _canonical_filterset_params(self, filterset_class) -> dict[str, str]:
+        params = {}
+        for name, query_filter in filterset_class.base_filters.items():
+            value = self.request.GET.get(name)
+            if value in (None, ""):
+                continue
+            field = query_filter.field
+            try:
+                # Coerce related lookups through the key field instead of querying for the row
+                if isinstance(field, ModelChoiceField):
+                    value = field.queryset.model._meta.pk.to_python(value)
+                else:
+                    value = field.clean(value)
+            except ValidationError:
+                # Invalid values are rejected by the filter, keep them apart from valid ones
+                params[name] = f"invalid:{value}"
+                continue
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = str(value).lower()
+            elif hasattr(value, "isoformat"):
+                value = value.isoformat()
+            params[name] = str(value)
+        return params
+
+    def get_cache_row_namespace(self) -> Optional[str]:
+        """Return the namespace of the row requested from a per-row detail view.
+
+        Returns:
+            str or None: The row namespace, or None for list requests and views that do not
+            cache per row.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if not self.cache_per_row or lookup_url_kwarg not in self.kwargs:
+            return None
+        return row_namespace(self.primary_model, self.kwargs[lookup_url_kwarg])
+
+    def get_cache_key(
+        self, generation: Optional[int] = None, row_generation: Optional[int] = None
+    ) -> str:
         """Generate a unique cache key based on the request and model information.
 
-        This method constructs a cache key that incorporates the user ID, query parameters,
-        and model names associated with the view.
+        This method constructs a cache key that incorporates the cache scope (public, the
+        user's role or the user ID), query parameters, and model names associated with the
+        view, along with the current generation of the
+        view's namespace so that invalidation never has to find existing keys.
+        Per-row detail requests also embed the generation of the row's namespace.
+
+        Args:
+            generation (int, optional): Build the key for this generation of the namespace
+                instead of the current one.
+            row_generation (int, optional): Build the key for this generation of the row
+                namespace instead of the current one.
 
         Returns:
             str: A unique cache key for the current request.
@@ -43,8 +654,8 @@ class CachedResponseMixin:
         Raises:
             AttributeError: If the view does not have a 'primary_model' attribute.
         """
-        user_id = self.request.user.id if self.request.user.is_authenticated else "anon"
-        query_params = self.request.GET.urlencode()
+        scope_key = self.get_cache_scope_key()
+        query_params = self.get_canonical_query_params()
         query_params_hash = hashlib.md5(query_params.encode("utf-8")).hexdigest()
 
         # Get the model name(s) associated with the view
@@ -63,12 +674,52 @@ class CachedResponseMixin:
         # Combine the model names into a string
         model_names_str = "_".join(model_names)
 
-        return f"{primary_model.__name__}:{self.__class__.__name__}_{model_names_str}_{user_id}_{query_params_hash}_cache_key"
+        # Rendered bodies are only valid for the renderer that produced them
+        if self.cache_rendered_response:
+            model_names_str = (
+                f"{model_names_str}_{self.request.accepted_renderer.format}"
+            )
+
+        namespace = self.get_cache_namespace()
+        row_ns = self.get_cache_row_namespace()
+        generations = get_namespace_generations(filter(None, [namespace, row_ns]))
+        if generation is None:
+            generation = generations[namespace]
+        prefix = f"{hash_tag(namespace)}:g{generation}"
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if row_ns is not None:
+            if row_generation is None:
+                row_generation = generations[row_ns]
+            prefix = f"{prefix}:{row_ns}:r{row_generation}"
+        elif lookup_url_kwarg in self.kwargs:
+            # Detail lookups of views that do not cache per row still need a key per object
+            prefix = f"{prefix}:{lookup_url_kwarg}={self.kwargs[lookup_url_kwarg]}"
+
+        return f"{prefix}:{model_names_str}_{scope_key}_{query_params_hash}_cache_key"
+
+    def get_previous_cache_key(self) -> Optional[str]:
+        """Return the key this request had before the last invalidation of its namespace.
+
+        For per-row detail requests this is the key from before the last change to the row,
+        which is by far the most frequent invalidation of a detail entry.
+
+        Returns:
+            str or None: The cache key for the previous generation, or None if the
+            namespace has never been invalidated.
+        """
+        if row_ns := self.get_cache_row_namespace():
+            row_generation = get_namespace_generation(row_ns)
+            if row_generation:
+                return self.get_cache_key(row_generation=row_generation - 1)
+        generation = get_namespace_generation(self.get_cache_namespace())
+        return self.get_cache_key(generation=generation - 1) if generation else None
 
     def get_cached_response(self, cache_key) -> Union[Response | None]:
         """Retrieve cached data using the provided cache key.
 
-        This method checks if there is cached data for the given cache key and returns it if available.
+        This method checks if there is fresh cached data for the given cache key and returns it
+        if available, looking in this worker's L1 before Redis. Entries past their freshness
+        window, or picked for early recomputation, are treated as a miss.
 
         Args:
             cache_key (str): The cache key to look up.
@@ -76,31 +727,392 @@ class CachedResponseMixin:
         Returns:
             Response or None: The cached response if found, otherwise None.
         """
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            logger.debug(
-                f"Cache Hit for {self.primary_model.__name__} - Cache Key: {cache_key}"
-            )
-            cached_queryset_hit.labels(model=self.primary_model.__name__).inc()
-            return Response(cached_data, status=status.HTTP_200_OK)
+        now = time.time()
+        model_name = self.primary_model.__name__
+        tier_hit_counter = cached_queryset_l1_hit
+        entry = local_cache.get(cache_key)
+        if entry is None or entry["fresh_until"] <= now:
+            tier_hit_counter = cached_queryset_l2_hit
+            entry = cache.get(cache_key)
+            if entry is not None and ensure_invalidation_listener():
+                local_cache.set(cache_key, entry)
+        namespace = self.get_cache_namespace()
+        if entry is not None and entry["fresh_until"] > now:
+            if self.should_recompute_early(entry, now):
+                logger.debug(
+                    f"Early recompute for {model_name} - Cache Key: {cache_key}"
+                )
+                cached_queryset_early_recompute.labels(model=model_name).inc()
+                record_access(namespace, cache_key, hit=False)
+                return None
+            logger.debug(f"Cache Hit for {model_name} - Cache Key: {cache_key}")
+            cached_queryset_hit.labels(model=model_name).inc()
+            tier_hit_counter.labels(model=model_name).inc()
+            if tier_hit_counter is cached_queryset_l2_hit:
+                touch_namespace_entry(namespace, cache_key)
+            record_access(namespace, cache_key, hit=True)
+            return self.response_from_entry(entry)
         else:
-            logger.debug(
-                f"Cache Miss for {self.primary_model.__name__}  - Cache Key: {cache_key}"
-            )
-            cached_queryset_miss.labels(model=self.primary_model.__name__).inc()
+            logger.debug(f"Cache Miss for {model_name}  - Cache Key: {cache_key}")
+            record_access(namespace, cache_key, hit=False)
             return None
 
-    def cache_response(self, cache_key, data):
-        """Store data in the cache with the specified cache key.
+    def should_recompute_early(self, entry: dict, now: float) -> bool:
+        """Decide whether a fresh entry should be recomputed ahead of its expiry.
 
-        This method saves the provided data in the cache for a duration of one hour.
+        This is XFetch: the entry is treated as expired once `now` plus its compute time,
+        scaled by `VIEW_CACHE_XFETCH_BETA` and an exponentially distributed random factor,
+        passes its freshness deadline. Expensive entries close to expiry are therefore
+        recomputed early by a single request, before concurrent requests all miss.
 
         Args:
-            cache_key (str): The cache key under which to store the data.
-            data: The data to be cached.
+            entry (dict): A fresh cache entry.
+            now (float): The current time.
+
+        Returns:
+            bool: True if this request should recompute the entry.
+        """
+        # 1 - random() lies in (0, 1], so the logarithm is always defined
+        gap = (
+            entry.get("delta", 0.0)
+            * settings.VIEW_CACHE_XFETCH_BETA
+            * -math.log(1 - random.random())
+        )
+        return now + gap >= entry["fresh_until"]
+
+    def get_cache_ttl_jitter(self) -> float:
+        """Return the fraction the TTL of this view's entries is jittered by.
+
+        Returns:
+            float: `cache_ttl_jitter`, or `VIEW_CACHE_TTL_JITTER` if it is not set.
+        """
+        if self.cache_ttl_jitter is None:
+            return settings.VIEW_CACHE_TTL_JITTER
+        return self.cache_ttl_jitter
+
+    def get_cache_ttl(self) -> float:
+        """Return the freshness TTL of a new entry, randomly jittered around `VIEW_CACHE_TTL`.
+
+        Returns:
+            float: The number of seconds the entry is fresh for.
         """
-        logger.debug(f"New Cache Set {cache_key}: {data}")
-        cache.set(cache_key, data, timeout=settings.VIEW_CACHE_TTL)
+        jitter = self.get_cache_ttl_jitter()
+        return settings.VIEW_CACHE_TTL * random.uniform(1 - jitter, 1 + jitter)
+
+    def get_max_cache_timeout(self) -> int:
+        """Return the longest any entry of this view is kept in Redis.
+
+        This is the largest jittered TTL, or the negative TTL if it is longer, plus the
+        stale window.
+
+        Returns:
+            int: The number of seconds.
+        """
+        max_ttl = max(
+            settings.VIEW_CACHE_TTL * (1 + self.get_cache_ttl_jitter()),
+            settings.VIEW_CACHE_NEGATIVE_TTL,
+        )
+        return math.ceil(max_ttl + settings.VIEW_CACHE_STALE_TTL)
+
+    def build_cache_entry(self, response: Response) -> dict:
+        """Build the cache entry for a freshly generated response.
+
+        In rendered mode the response is rendered once with the negotiated renderer and the
+        body is stored with its content type. Otherwise the response data is stored, which
+        for paginated responses includes the pagination envelope.
+
+        Args:
+            response (Response): The response generated on a miss.
+
+        Returns:
+            dict: The cache entry, without its freshness deadline.
+        """
+        if not self.cache_rendered_response:
+            content = json.dumps(response.data, sort_keys=True, cls=DjangoJSONEncoder)
+            return {
+                "data": response.data,
+                "status": response.status_code,
+                "content_hash": hashlib.md5(content.encode("utf-8")).hexdigest(),
+            }
+        renderer = self.request.accepted_renderer
+        renderer_context = self.get_renderer_context()
+        renderer_context["response"] = response
+        body = renderer.render(
+            response.data, self.request.accepted_media_type, renderer_context
+        )
+        content_type = self.request.accepted_media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        # Hash before compressing, gzip output embeds a timestamp
+        content_hash = hashlib.md5(body).hexdigest()
+        encoding = None
+        if len(body) >= settings.VIEW_CACHE_COMPRESS_MIN_BYTES:
+            encoding = compression.resolve_encoding(settings.VIEW_CACHE_COMPRESSION)
+            body = compression.compress(body, encoding)
+        return {
+            "body": body,
+            "encoding": encoding,
+            "content_type": content_type,
+            "status": response.status_code,
+            "content_hash": content_hash,
+        }
+
+    def response_from_entry(self, entry: dict) -> Union[Response | HttpResponse]:
+        """Rebuild the HTTP response for a cache entry.
+
+        Compressed bodies are passed through untouched when the client accepts their
+        encoding and are decompressed otherwise. When the request's conditional headers
+        match the entry, a 304 is returned without the body.
+
+        Args:
+            entry (dict): A cache entry produced by `build_cache_entry`.
+
+        Returns:
+            Response or HttpResponse: The response to send.
+        """
+        etag = f'"{entry["content_hash"]}"'
+        if "body" not in entry:
+            # Data entries are rendered per request, so each format is its own representation
+            etag = f'"{entry["content_hash"]}-{self.request.accepted_renderer.format}"'
+            response = Response(entry["data"], status=entry["status"])
+            return self.conditional_response(response, etag, entry["stored_at"])
+        body, encoding = entry["body"], entry["encoding"]
+        if encoding and compression.accepts_encoding(self.request, encoding):
+            etag = f'"{entry["content_hash"]}-{encoding}"'
+        elif encoding:
+            body, encoding = compression.decompress(body, encoding), None
+        response = HttpResponse(
+            body, content_type=entry["content_type"], status=entry["status"]
+        )
+        if encoding:
+            response["Content-Encoding"] = encoding
+        if entry["encoding"]:
+            patch_vary_headers(response, ["Accept-Encoding"])
+        return self.conditional_response(response, etag, entry["stored_at"])
+
+    def conditional_response(
+        self, response: Union[Response | HttpResponse], etag: str, stored_at: float
+    ) -> Union[Response | HttpResponse]:
+        """Set the validators of a cached response and evaluate the request against them.
+
+        Args:
+            response (Response or HttpResponse): The response rebuilt from a cache entry.
+            etag (str): The quoted strong ETag of the response's representation.
+            stored_at (float): When the entry was built, used as its Last-Modified time.
+
+        Returns:
+            Response or HttpResponse: A 304 or 412 if a precondition applies, otherwise
+            `response`.
+        """
+        # Negative entries have no representation to validate
+        if not 200 <= response.status_code < 300:
+            return response
+        last_modified = int(stored_at)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified, response=response
+        )
+
+    def cache_response(
+        self, cache_key, response: Response, compute_time: float = 0.0
+    ) -> dict:
+        """Store a response in the cache with the specified cache key.
+
+        The entry is fresh for a jittered `VIEW_CACHE_TTL` (see `get_cache_ttl`) and is kept
+        for another `VIEW_CACHE_STALE_TTL` seconds, during which it may still be served while
+        a single worker rebuilds it. Negative entries for a 404 are only fresh for
+        `VIEW_CACHE_NEGATIVE_TTL` seconds. Namespaces listed in
+        `VIEW_CACHE_NAMESPACE_BUDGETS` then evict their least recently used entries until
+        they fit their budget again.
+
+        Args:
+            cache_key (str): The cache key under which to store the response.
+            response (Response): The response to be cached.
+            compute_time (float, optional): Seconds it took to build the response, used to
+                recompute it ahead of its expiry.
+
+        Returns:
+            dict: The stored cache entry.
+        """
+        logger.debug(f"New Cache Set {cache_key}: {response.data}")
+        entry = self.build_cache_entry(response)
+        if response.status_code == status.HTTP_404_NOT_FOUND:
+            ttl = settings.VIEW_CACHE_NEGATIVE_TTL
+        else:
+            ttl = self.get_cache_ttl()
+        entry["stored_at"] = time.time()
+        entry["fresh_until"] = entry["stored_at"] + ttl
+        entry["delta"] = compute_time
+        cache.set(
+            cache_key,
+            entry,
+            timeout=math.ceil(ttl + settings.VIEW_CACHE_STALE_TTL),
+        )
+        enforce_namespace_budget(
+            self.get_cache_namespace(), cache_key, self.get_max_cache_timeout()
+        )
+        if ensure_invalidation_listener():
+            local_cache.set(cache_key, entry)
+        return entry
+
+    def build_and_cache_response(
+        self, cache_key: str, build_response: Callable[[], Response]
+    ) -> Union[Response | HttpResponse]:
+        """Build the response for a miss, cache it along with its compute time, and return it.
+
+        Args:
+            cache_key (str): The cache key for the current request.
+            build_response (Callable): Builds the response on a miss.
+
+        Returns:
+            Response or HttpResponse: The newly generated response.
+        """
+        started = time.perf_counter()
+        response = build_response()
+        compute_time = time.perf_counter() - started
+        return self.response_from_entry(
+            self.cache_response(cache_key, response, compute_time=compute_time)
+        )
+
+    def serve_cached_response(
+        self, cache_key: str, build_response: Callable[[], Response]
+    ) -> Union[Response | HttpResponse]:
+        """Serve a response from the cache, rebuilding it at most once across workers.
+
+        On a miss, the first worker to take the short-lived Redis lock for the key rebuilds
+        the entry. Concurrent workers serve the stale entry (or the entry from before the last
+        invalidation) while that happens, unless it is a 404. If there is nothing to serve,
+        they wait briefly for the rebuild instead of running the same queries themselves.
+
+        Args:
+            cache_key (str): The cache key for the current request.
+            build_response (Callable): Builds the response on a miss.
+
+        Returns:
+            Response or HttpResponse: The cached or newly generated response.
+        """
+        if cached_response := self.get_cached_response(cache_key):
+            return cached_response
+
+        model_name = self.primary_model.__name__
+        lock = cache.lock(f"{cache_key}:lock", timeout=settings.VIEW_CACHE_LOCK_TIMEOUT)
+        if lock.acquire(blocking=False):
+            return self.rebuild_cached_response(cache_key, build_response, lock)
+
+        # Another worker is already rebuilding this entry, keep serving the previous value.
+        # A stale 404 is not served, the object may have been created since.
+        entry = cache.get(cache_key)
+        if not is_servable_stale(entry) and (
+            previous_cache_key := self.get_previous_cache_key()
+        ):
+            entry = cache.get(previous_cache_key)
+        if is_servable_stale(entry):
+            logger.debug(f"Serving stale {model_name} - Cache Key: {cache_key}")
+            cached_queryset_stale_served.labels(model=model_name).inc()
+            return self.response_from_entry(entry)
+
+        if lock.acquire(blocking=True, blocking_timeout=settings.VIEW_CACHE_LOCK_WAIT):
+            if (entry := cache.get(cache_key)) is not None:
+                self.release_cache_lock(lock, cache_key)
+                cached_queryset_coalesced.labels(model=model_name).inc()
+                return self.response_from_entry(entry)
+            return self.rebuild_cached_response(cache_key, build_response, lock)
+
+        logger.warning(f"Timed out waiting on cache rebuild for {cache_key}")
+        cached_queryset_lock_timeout.labels(model=model_name).inc()
+        if (entry := cache.get(cache_key)) is not None:
+            cached_queryset_coalesced.labels(model=model_name).inc()
+            return self.response_from_entry(entry)
+        cached_queryset_miss.labels(model=model_name).inc()
+        return self.build_and_cache_response(cache_key, build_response)
+
+    def caches_rendered_body(self) -> bool:
+        """Return whether the body rendered for this request may be cached and shared.
+
+        Returns:
+            bool: True if the negotiated renderer is a JSON renderer.
+        """
+        return isinstance(self.request.accepted_renderer, JSONRenderer)
+
+    def serve_response(
+        self, build_response: Callable[[], Response]
+    ) -> Union[Response | HttpResponse]:
+        """Serve the request through the cache, or straight from the database during an outage.
+
+        Cache errors are reported to `cache_breaker`. While it is open the cache is not
+        called at all, so a degraded Redis cannot hold requests up.
+
+        Args:
+            build_response (Callable): Builds the response on a miss.
+
+        Returns:
+            Response or HttpResponse: The cached or newly generated response.
+        """
+        model_name = self.primary_model.__name__
+        if self.cache_rendered_response and not self.caches_rendered_body():
+            self.cache_fragments = False
+            return build_response()
+        if cache_breaker.allow_request():
+            built = None
+
+            def build_once() -> Response:
+                nonlocal built
+                built = build_response()
+                return built
+
+            unavailable = False
+            try:
+                bump_deferred_invalidations()
+                return self.serve_cached_response(self.get_cache_key(), build_once)
+            except CACHE_UNAVAILABLE_ERRORS as e:
+                unavailable = True
+                logger.warning(f"Cache unavailable, serving {model_name} uncached: {e}")
+                cache_breaker.record_failure()
+            finally:
+                # Other errors, e.g. a 404 for a bad cursor, say nothing about Redis. They
+                # must still end a probe, or the breaker would stay half open for good.
+                if not unavailable:
+                    cache_breaker.record_success()
+            # Redis failed after the build, e.g. on the write: do not run the queries again
+            if built is not None:
+                cached_queryset_bypassed.labels(model=model_name).inc()
+                return built
+        cached_queryset_bypassed.labels(model=model_name).inc()
+        # Fragments are kept in Redis as well
+        self.cache_fragments = False
+        return build_response()
+
+    def rebuild_cached_response(
+        self, cache_key: str, build_response: Callable[[], Response], lock
+    ) -> Union[Response | HttpResponse]:
+        """Build and cache the response while holding the rebuild lock for the key.
+
+        Args:
+            cache_key (str): The cache key for the current request.
+            build_response (Callable): Builds the response on a miss.
+            lock: The acquired rebuild lock, released once the entry is written.
+
+        Returns:
+            Response or HttpResponse: The newly generated response.
+        """
+        cached_queryset_miss.labels(model=self.primary_model.__name__).inc()
+        try:
+            return self.build_and_cache_response(cache_key, build_response)
+        finally:
+            self.release_cache_lock(lock, cache_key)
+
+    def release_cache_lock(self, lock, cache_key: str) -> None:
+        """Release a rebuild lock, tolerating a lock that already expired.
+
+        Args:
+            lock: The acquired rebuild lock.
+            cache_key (str): The cache key the lock protects.
+        """
+        try:
+            lock.release()
+        except LockNotOwnedError:
+            logger.warning(f"Cache rebuild lock expired before release for {cache_key}")
 
     def list(self, request, *args, **kwargs) -> Response:
         """Handle GET requests for listing resources with caching.
@@ -116,31 +1128,141 @@ class CachedResponseMixin:
         Returns:
             Response: The cached or newly generated response.
         """
-        cache_key = self.get_cache_key()
-        if cached_response := self.get_cached_response(cache_key):
-            return cached_response
 
-        # If cache miss, proceed as usual
-        queryset = self.filter_queryset(self.get_queryset())
+        def build_response() -> Response:
+            queryset = self.filter_queryset(self.get_queryset())
+            if self.cache_fragments:
+                return self.list_from_fragments(queryset)
+
+            items = self.get_list_items(queryset)
+
+            # Apply pagination if needed
+            page = self.paginate_queryset(items)
+            if page is not None:
+                return self.get_paginated_response(self.serialize_list_items(page))
+
+            return Response(self.serialize_list_items(items))
+
+        return self.serve_response(build_response)
+
+    def get_list_items(self, queryset):
+        """Return what a list response is serialized from.
+
+        Args:
+            queryset (QuerySet): The filtered queryset of the list.
+
+        Returns:
+            QuerySet: `.values()` rows, with the primary key as "pk", when the serializer has
+            a fast path, otherwise `queryset` itself.
+        """
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, "represent_values"):
+            fields = dict.fromkeys(
+                (*serializer_class.values_fields, *self.get_position_fields())
+            )
+            return queryset.values("pk", *fields)
+        return queryset
+
+    def get_position_fields(self) -> List[str]:
+        """Return the fields the paginator reads the position of a row from.
+
+        Returns:
+            List[str]: The keyset ordering fields, empty without keyset pagination.
+        """
+        paginator = self.paginator
+        if isinstance(paginator, KeysetPagination):
+            return list(paginator.get_position_fields(self))
+        return []
+
+    def serialize_list_items(self, items) -> List[dict]:
+        """Serialize the items of a list response, taken from `get_list_items`.
 
-        # Apply pagination if needed
-        page = self.paginate_queryset(queryset)
+        Args:
+            items (Iterable): Rows or model instances, as returned by `get_list_items`.
+
+        Returns:
+            List[dict]: The serialized items.
+        """
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, "represent_values"):
+            return [serializer_class.represent_values(row) for row in items]
+        return self.get_serializer(items, many=True).data
+
+    def list_from_fragments(self, queryset) -> Response:
+        """Build a list response from the page's primary keys and the cached item fragments.
+
+        Args:
+            queryset (QuerySet): The filtered queryset of the list.
+
+        Returns:
+            Response: The (paginated) list response.
+        """
+        position_fields = self.get_position_fields()
+        if position_fields:
+            rows = queryset.values("pk", *position_fields)
+            page = self.paginate_queryset(rows)
+            pks = [row["pk"] for row in (page if page is not None else rows)]
+        else:
+            pks = queryset.values_list("pk", flat=True)
+            page = self.paginate_queryset(pks)
+            pks = page if page is not None else pks
+        data = self.get_cached_fragments(queryset, pks)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            data = serializer.data
-            self.cache_response(cache_key, data)
             return self.get_paginated_response(data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        data = serializer.data
-        self.cache_response(cache_key, data)
         return Response(data)
 
+    def get_cached_fragments(self, queryset, pks: Iterable) -> List[dict]:
+        """Return the serialized items for the given primary keys, in order.
+
+        Fragments are read with a single `get_many`. Only the items whose fragment is
+        missing are fetched and serialized, and their fragments are written back for the
+        next page that lists them.
+
+        Args:
+            queryset (QuerySet): The filtered queryset the primary keys were taken from.
+            pks (Iterable): The primary keys of the items to return.
+
+        Returns:
+            List[dict]: The serialized items. Items deleted since their primary key was
+            read are left out.
+        """
+        pks = list(pks)
+        model_name = self.primary_model.__name__
+        fragment_ns = self.get_cache_fragment_namespace()
+        row_namespaces = {pk: row_namespace(self.primary_model, pk) for pk in pks}
+        generations = get_namespace_generations([fragment_ns, *row_namespaces.values()])
+        # Fragments are tagged with their row, so they spread over every shard
+        suffix = f"{fragment_ns}:g{generations[fragment_ns]}"
+        fragment_keys = {
+            pk: f"{hash_tag(row_ns)}:r{generations[row_ns]}:{suffix}"
+            for pk, row_ns in row_namespaces.items()
+        }
+        fragments = cache.get_many(list(fragment_keys.values()))
+        missing = [pk for pk, key in fragment_keys.items() if key not in fragments]
+        cached_queryset_fragment_hit.labels(model=model_name).inc(
+            len(pks) - len(missing)
+        )
+        if missing:
+            cached_queryset_fragment_miss.labels(model=model_name).inc(len(missing))
+            items = list(self.get_list_items(queryset.filter(pk__in=missing)))
+            serialized = self.serialize_list_items(items)
+            built = {
+                fragment_keys[item["pk"] if isinstance(item, dict) else item.pk]: data
+                for item, data in zip(items, serialized)
+            }
+            cache.set_many(built, timeout=settings.VIEW_CACHE_FRAGMENT_TTL)
+            fragments.update(built)
+        return [
+            fragments[fragment_keys[pk]] for pk in pks if fragment_keys[pk] in fragments
+        ]
+
     def retrieve(self, request, *args, **kwargs) -> Response:
         """Handle GET requests for retrieving a single resource with caching.
 
         This method checks for a cached response and returns it if available;
         otherwise, it retrieves the resource, caches it, and returns the response.
+        Lookups of missing objects are cached as short-lived negative entries. They share
+        the key of the object they miss, so creating it invalidates them like any change.
 
         Args:
             request: The HTTP request object.
@@ -150,29 +1272,98 @@ class CachedResponseMixin:
         Returns:
             Response: The cached or newly generated response.
         """
-        cache_key = self.get_cache_key()
-        if cached_response := self.get_cached_response(cache_key):
-            return cached_response
 
-        # If cache miss, proceed as usual
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        data = serializer.data
-        self.cache_response(cache_key, data)
-        return Response(data)
+        def build_response() -> Response:
+            try:
+                instance = self.get_object()
+            except Http404 as e:
+                return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+            serializer = self.get_serializer(instance)
+            return Response(serializer.data)
+
+        return self.serve_response(build_response)
+
+
+class InvalidationBatch:
+    """Namespaces invalidated within one transaction, flushed once it commits.
+
+    The batch is registered with `transaction.on_commit`, so a rolled back transaction
+    invalidates nothing and a committed one bumps each namespace exactly once. If Redis is
+    unavailable the namespaces are deferred until it answers again.
+    """
+
+    def __init__(self):
+        self.namespaces: set[str] = set()
+        self.model_names: set[str] = set()
+        self.flushed = False
 
+    def add(self, model_name: str, namespaces: Iterable[str]) -> None:
+        self.model_names.add(model_name)
+        self.namespaces.update(namespaces)
 
-@receiver([post_save, post_delete])
-def invalidate_cache(sender, **kwargs):
+    def __call__(self) -> None:
+        self.flushed = True
+        if not cache_breaker.allow_request():
+            logger.warning(
+                f"Cache unavailable, deferring invalidation of {self.namespaces}"
+            )
+            defer_invalidation(self.namespaces)
+            return
+        unavailable = False
+        try:
+            bump_deferred_invalidations()
+            # Moving the namespaces to a new generation orphans every key written under the old one
+            generations = bump_namespace_generations(self.namespaces)
+        except CACHE_UNAVAILABLE_ERRORS as e:
+            unavailable = True
+            logger.error(f"Cache invalidation of {self.namespaces} deferred: {e}")
+            cache_breaker.record_failure()
+            defer_invalidation(self.namespaces)
+            return
+        finally:
+            # Any other error must still end a probe, see CachedResponseMixin.serve_response
+            if not unavailable:
+                cache_breaker.record_success()
+        for model_name in self.model_names:
+            cached_queryset_evicted.labels(model=model_name).inc()
+        logger.info(f"Cache invalidated for models: {self.model_names} {generations}")
+
+
+def get_invalidation_batch(using: str) -> InvalidationBatch:
+    """Return the pending invalidation batch of the current transaction, creating it if needed.
+
+    Args:
+        using (str): The database alias the change was written to.
+
+    Returns:
+        InvalidationBatch: The batch that will be flushed when the transaction commits.
+    """
+    connection = transaction.get_connection(using)
+    # A namespace added from a savepoint that later rolls back is still bumped, which is harmless
+    for _, callback, _ in connection.run_on_commit:
+        if isinstance(callback, InvalidationBatch) and not callback.flushed:
+            return callback
+    batch = InvalidationBatch()
+    transaction.on_commit(batch, using=using, robust=True)
+    return batch
+
+
+def invalidate_cache(sender, instance=None, using=None, **kwargs):
     model_name = sender.__name__
     logger.debug(f"Signal Received For {model_name}")
-    # Pattern to match cache keys that include the model name as namespace
-    cache_key_pattern = f"{model_name}:*"
-    logger.debug(f'Searching For Cache Key Pattern" {cache_key_pattern}')
-    if cache_keys := cache.keys(cache_key_pattern):
-        cache.delete_many(cache_keys)
-        logger.info(f"Cache invalidated for model: {model_name}")
+    namespaces = set(cache_dependency_registry.get(sender, ()))
+    if (
+        sender in row_cache_registry
+        and instance is not None
+        and instance.pk is not None
+    ):
+        namespaces.add(row_namespace(sender, instance.pk))
+    if not namespaces:
+        logger.debug(f"No cached views depend on model: {model_name}")
+        return
+    if transaction.get_connection(using).in_atomic_block:
+        get_invalidation_batch(using).add(model_name, namespaces)
     else:
-        logger.debug(
-            f"No cache keys found for model: {model_name} using {cache_key_pattern}"
-        )
+        batch = InvalidationBatch()
+        batch.add(model_name, namespaces)
+        batch()
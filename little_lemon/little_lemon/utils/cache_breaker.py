@@ -0,0 +1,122 @@
+import threading
+import time
+
+from django_redis.exceptions import ConnectionInterrupted
+from loguru import logger
+from prometheus_client import Counter, Gauge
+from redis.exceptions import ConnectionError, TimeoutError
+
+# Errors meaning Redis is unreachable or too slow, as raised by django-redis and redis-py
+CACHE_UNAVAILABLE_ERRORS = (ConnectionInterrupted, ConnectionError, TimeoutError)
+
+BREAKER_CLOSED = "closed"
+BREAKER_HALF_OPEN = "half_open"
+BREAKER_OPEN = "open"
+BREAKER_STATES = (BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN)
+
+cached_queryset_breaker_state = Gauge(
+    "cached_queryset_breaker_state",
+    "State of the cache circuit breaker, 1 for the current state and 0 for the others",
+    ["breaker", "state"],
+)
+cached_queryset_breaker_opened = Counter(
+    "cached_queryset_breaker_opened",
+    "Number of times the cache circuit breaker opened",
+    ["breaker"],
+)
+cached_queryset_breaker_failures = Counter(
+    "cached_queryset_breaker_failures",
+    "Number of cache calls that failed because Redis was unavailable",
+    ["breaker"],
+)
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker guarding the calls a worker makes to Redis.
+
+    The breaker is closed while Redis answers. After `failure_threshold` consecutive
+    failures it opens, and callers bypass the cache instead of waiting on a degraded
+    Redis. Once `recovery_timeout` seconds have passed, a single caller is let through
+    as a probe (half open): its success closes the breaker again, its failure reopens it.
+    A caller let through must report one or the other whatever happens, even when the call
+    fails for reasons unrelated to Redis, or the probe never ends and the cache stays
+    bypassed.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self._export_state()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return whether the caller may use the cache right now.
+
+        Returns:
+            bool: True while the breaker is closed, and for the single probe let through
+            once the recovery timeout has passed. False otherwise.
+        """
+        with self._lock:
+            if self._state == BREAKER_CLOSED:
+                return True
+            if self._probing:
+                return False
+            if time.monotonic() - self._opened_at < self.recovery_timeout:
+                return False
+            self._probing = True
+            self._set_state(BREAKER_HALF_OPEN)
+            logger.info(f"Cache circuit breaker {self.name} probing Redis")
+            return True
+
+    def record_success(self) -> None:
+        """Record a cache call that completed, closing the breaker after a probe."""
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self._state != BREAKER_CLOSED:
+                logger.info(f"Cache circuit breaker {self.name} closed")
+                self._set_state(BREAKER_CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a cache call that failed, opening the breaker if the threshold is hit."""
+        cached_queryset_breaker_failures.labels(breaker=self.name).inc()
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if (
+                self._state == BREAKER_HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                if self._state != BREAKER_OPEN:
+                    logger.warning(
+                        f"Cache circuit breaker {self.name} opened after {self._failures} failures"
+                    )
+                    cached_queryset_breaker_opened.labels(breaker=self.name).inc()
+                self._opened_at = time.monotonic()
+                self._set_state(BREAKER_OPEN)
+
+    def reset(self) -> None:
+        """Close the breaker and forget past failures."""
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self._set_state(BREAKER_CLOSED)
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        self._export_state()
+
+    def _export_state(self) -> None:
+        for state in BREAKER_STATES:
+            cached_queryset_breaker_state.labels(breaker=self.name, state=state).set(
+                int(state == self._state)
+            )
@@ -0,0 +1,170 @@
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from loguru import logger
+from prometheus_client import Counter, Gauge
+from redis.exceptions import RedisError
+
+from little_lemon.utils.cache_shard import hash_tag
+
+cached_namespace_budget_evicted = Counter(
+    "cached_queryset_budget_evicted",
+    "Number of cache entries evicted to keep a namespace within its budget",
+    ["namespace"],
+)
+cached_namespace_budget_entries = Gauge(
+    "cached_queryset_budget_entries",
+    "Number of entries tracked against a namespace's budget",
+    ["namespace"],
+)
+cached_namespace_budget_bytes = Gauge(
+    "cached_queryset_budget_bytes",
+    "Bytes tracked against a namespace's budget",
+    ["namespace"],
+)
+cached_namespace_budget_usage = Gauge(
+    "cached_queryset_budget_usage",
+    "Largest share of its entry or byte budget a namespace uses, before eviction",
+    ["namespace"],
+)
+
+# KEYS: the entry, the recency index, the size index, the byte total, the expiry index
+# ARGV: now, max entries (0 for none), max bytes (0 for none), index TTL
+# Forgets the entries that expired on their own, records the entry's size, recency and
+# expiry, then drops the least recently used entries of the namespace from the indexes
+# until it fits. Only declared keys are touched, as Dragonfly requires by default, so the
+# evicted entries are returned for the caller to delete. Returns the entries, bytes, peak
+# usage and evicted keys.
+ENFORCE_BUDGET_SCRIPT = """
+local entry, lru, sizes, total, expiries = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5]
+local now, max_entries, max_bytes, ttl = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local function forget(key)
+    redis.call('DECRBY', total, tonumber(redis.call('HGET', sizes, key) or '0'))
+    redis.call('HDEL', sizes, key)
+    redis.call('ZREM', lru, key)
+    redis.call('ZREM', expiries, key)
+end
+for _, key in ipairs(redis.call('ZRANGEBYSCORE', expiries, '-inf', now)) do
+    forget(key)
+end
+local size = redis.call('STRLEN', entry)
+local previous = tonumber(redis.call('HGET', sizes, entry) or '0')
+redis.call('ZADD', lru, now, entry)
+redis.call('HSET', sizes, entry, size)
+local pttl = redis.call('PTTL', entry)
+if pttl > 0 then
+    redis.call('ZADD', expiries, now + pttl / 1000, entry)
+else
+    redis.call('ZREM', expiries, entry)
+end
+local bytes = redis.call('INCRBY', total, size - previous)
+local entries = redis.call('ZCARD', lru)
+local usage = 0
+if max_entries > 0 then usage = math.max(usage, entries / max_entries) end
+if max_bytes > 0 then usage = math.max(usage, bytes / max_bytes) end
+local evicted = {}
+while entries > 1 and ((max_entries > 0 and entries > max_entries) or (max_bytes > 0 and bytes > max_bytes)) do
+    local oldest = redis.call('ZRANGE', lru, 0, 0)[1]
+    if oldest == entry then break end
+    forget(oldest)
+    bytes = tonumber(redis.call('GET', total))
+    entries = entries - 1
+    table.insert(evicted, oldest)
+end
+redis.call('EXPIRE', lru, ttl)
+redis.call('EXPIRE', sizes, ttl)
+redis.call('EXPIRE', total, ttl)
+redis.call('EXPIRE', expiries, ttl)
+return {entries, bytes, tostring(usage), evicted}
+"""
+
+_enforce_budget = None
+
+
+def get_namespace_budget(namespace: str) -> Optional[dict]:
+    """Return the budget configured for a namespace in `VIEW_CACHE_NAMESPACE_BUDGETS`, if any."""
+    return settings.VIEW_CACHE_NAMESPACE_BUDGETS.get(namespace)
+
+
+def budget_index_keys(namespace: str) -> list[str]:
+    """Return the Redis keys of a namespace's recency index, size index, byte total and expiry index.
+
+    They carry the namespace's hash tag, so the budget script only touches one shard.
+    """
+    return [
+        cache.client.make_key(f"cache-budget:{hash_tag(namespace)}:{name}")
+        for name in ("lru", "sizes", "bytes", "expiries")
+    ]
+
+
+def enforce_namespace_budget(namespace: str, cache_key: str, index_ttl: int) -> int:
+    """Account for a freshly written entry and evict the namespace's LRU entries over budget.
+
+    The entry's size is read in Redis, so it is the encoded, compressed size actually
+    stored. The accounting runs in one Lua script, so concurrent writers cannot overshoot
+    the budget between the check and the eviction, and entries that expired on their own
+    stop counting against it. The evicted entries are deleted right after. Failures are
+    logged and never affect the request.
+
+    Args:
+        namespace (str): The namespace the entry was written under.
+        cache_key (str): The key of the entry that was written.
+        index_ttl (int): Seconds the indexes are kept, at least the longest timeout an
+            entry of the namespace can be written with so none outlives its accounting.
+
+    Returns:
+        int: The number of entries evicted.
+    """
+    global _enforce_budget
+    budget = get_namespace_budget(namespace)
+    if budget is None:
+        return 0
+    entry_key = cache.client.make_key(cache_key)
+    client = cache.client.get_client_for_key(entry_key)
+    try:
+        if _enforce_budget is None:
+            _enforce_budget = client.register_script(ENFORCE_BUDGET_SCRIPT)
+        entries, total_bytes, usage, evicted_keys = _enforce_budget(
+            keys=[entry_key, *budget_index_keys(namespace)],
+            args=[
+                time.time(),
+                budget.get("max_entries", 0),
+                budget.get("max_bytes", 0),
+                index_ttl,
+            ],
+            client=client,
+        )
+        if evicted_keys:
+            # They share the namespace's hash tag, so they live on this client's shard
+            client.delete(*evicted_keys)
+    except RedisError as e:
+        logger.warning(f"Unable to enforce the cache budget of {namespace}: {e}")
+        return 0
+    cached_namespace_budget_entries.labels(namespace=namespace).set(entries)
+    cached_namespace_budget_bytes.labels(namespace=namespace).set(total_bytes)
+    cached_namespace_budget_usage.labels(namespace=namespace).set(float(usage))
+    evicted = len(evicted_keys)
+    if evicted:
+        logger.info(f"Evicted {evicted} entries to keep {namespace} within its budget")
+        cached_namespace_budget_evicted.labels(namespace=namespace).inc(evicted)
+    return evicted
+
+
+def touch_namespace_entry(namespace: str, cache_key: str) -> None:
+    """Mark a budgeted entry as recently used, so eviction picks colder entries first.
+
+    Args:
+        namespace (str): The namespace the entry belongs to.
+        cache_key (str): The key of the entry that was read.
+    """
+    if get_namespace_budget(namespace) is None:
+        return
+    lru_key = budget_index_keys(namespace)[0]
+    try:
+        cache.client.get_client_for_key(lru_key).zadd(
+            lru_key, {cache.client.make_key(cache_key): time.time()}, xx=True
+        )
+    except RedisError as e:
+        logger.warning(f"Unable to touch {cache_key} in the budget of {namespace}: {e}")
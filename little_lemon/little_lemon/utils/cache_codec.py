@@ -0,0 +1,201 @@
+import datetime
+import pickle
+import time
+from contextvars import ContextVar
+from decimal import Decimal
+from typing import Any, Union
+
+import msgpack
+from django_redis.client import DefaultClient
+from django_redis.compressors.base import BaseCompressor
+from django_redis.exceptions import CompressorError
+from django_redis.serializers.base import BaseSerializer
+from prometheus_client import Histogram
+
+from little_lemon.utils import compression
+
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+cached_value_serialized_bytes = Histogram(
+    "cached_queryset_serialized_bytes",
+    "Size of cached values after serialization, before compression",
+    ["model"],
+    buckets=SIZE_BUCKETS,
+)
+cached_value_stored_bytes = Histogram(
+    "cached_queryset_stored_bytes",
+    "Size of cached values as written to Redis",
+    ["model"],
+    buckets=SIZE_BUCKETS,
+)
+cached_value_encode_seconds = Histogram(
+    "cached_queryset_encode_seconds",
+    "Time spent serializing and compressing cached values",
+    ["model"],
+)
+cached_value_decode_seconds = Histogram(
+    "cached_queryset_decode_seconds",
+    "Time spent decompressing and deserializing cached values",
+    ["model"],
+)
+
+# 0xC1 is never used by the msgpack format, so it safely tags msgpack payloads
+MSGPACK_MARKER = b"\xc1"
+EXT_DECIMAL = 1
+EXT_DATETIME = 2
+EXT_DATE = 3
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# The model the value being encoded or decoded belongs to, set by InstrumentedClient
+_current_model: ContextVar[str] = ContextVar("cache_codec_model", default="other")
+
+
+def _encode_ext(value: Any) -> Union[msgpack.ExtType, dict, list]:
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(EXT_DECIMAL, str(value).encode("utf-8"))
+    if isinstance(value, datetime.datetime):
+        return msgpack.ExtType(EXT_DATETIME, value.isoformat().encode("utf-8"))
+    if isinstance(value, datetime.date):
+        return msgpack.ExtType(EXT_DATE, value.isoformat().encode("utf-8"))
+    # Serializer output (OrderedDict, ReturnDict, ReturnList) is packed as plain containers
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    raise TypeError(f"Cannot pack {type(value).__name__}")
+
+
+def _decode_ext(code: int, data: bytes) -> Any:
+    if code == EXT_DECIMAL:
+        return Decimal(data.decode("utf-8"))
+    if code == EXT_DATETIME:
+        return datetime.datetime.fromisoformat(data.decode("utf-8"))
+    if code == EXT_DATE:
+        return datetime.date.fromisoformat(data.decode("utf-8"))
+    return msgpack.ExtType(code, data)
+
+
+class MsgpackSerializer(BaseSerializer):
+    """Serialize cached values with msgpack, falling back to pickle.
+
+    Cache entries are made of dicts, lists, strings, numbers and bytes, which msgpack
+    stores far more compactly than pickle. Decimals and dates are packed as extension
+    types. Anything else msgpack cannot represent faithfully, such as tuples or the
+    responses and querysets other apps cache, is pickled as before. Values pickled by
+    the previous serializer are still readable.
+    """
+
+    def __init__(self, options):
+        super().__init__(options=options)
+        self._pickle_version = options.get("PICKLE_VERSION", pickle.DEFAULT_PROTOCOL)
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return MSGPACK_MARKER + msgpack.packb(
+                value, default=_encode_ext, strict_types=True, use_bin_type=True
+            )
+        except (TypeError, ValueError, OverflowError):
+            return pickle.dumps(value, self._pickle_version)
+
+    def loads(self, value: bytes) -> Any:
+        if value[:1] == MSGPACK_MARKER:
+            return msgpack.unpackb(
+                value[1:], ext_hook=_decode_ext, raw=False, strict_map_key=False
+            )
+        return pickle.loads(value)
+
+
+class ThresholdCompressor(BaseCompressor):
+    """Compress cached values once they exceed `COMPRESS_MIN_BYTES`.
+
+    Values are compressed with `COMPRESS_ENCODING` ("zstd" when available, "gzip"
+    otherwise). Compressed values are recognised by their frame magic bytes, so small
+    values are stored as is and the encoding can change without flushing Redis.
+    """
+
+    def __init__(self, options):
+        super().__init__(options=options)
+        self.min_length = options.get("COMPRESS_MIN_BYTES", 1024)
+        self.encoding = compression.resolve_encoding(
+            options.get("COMPRESS_ENCODING", "gzip")
+        )
+
+    def compress(self, value: bytes) -> bytes:
+        if self.encoding and len(value) >= self.min_length:
+            compressed = compression.compress(value, self.encoding)
+            # Entries holding already compressed bodies do not shrink any further
+            if len(compressed) < len(value):
+                return compressed
+        return value
+
+    def decompress(self, value: bytes) -> bytes:
+        if value[:4] == ZSTD_MAGIC:
+            return compression.decompress(value, "zstd")
+        if value[:2] == GZIP_MAGIC:
+            return compression.decompress(value, "gzip")
+        raise CompressorError("Value is not compressed")
+
+
+def key_model(key: Any) -> str:
+    """Return the model a cache key belongs to, e.g. "MenuItem" for "{MenuItem:pk:42}:generation".
+
+    Keys written outside the view cache namespaces are reported as "other" to keep the
+    label cardinality bounded.
+    """
+    model, separator, _ = str(key).lstrip("{").partition(":")
+    return model if separator and model.isidentifier() else "other"
+
+
+class InstrumentedClient(DefaultClient):
+    """django-redis client recording the size and codec time of every cached value.
+
+    The histograms are labelled with the model namespace of the key, so the effect of the
+    codec on Redis memory and network bytes can be compared per model.
+    """
+
+    def get_client_for_key(self, key, write: bool = True):
+        """Return the raw Redis client holding `key`, a key already built by `make_key`."""
+        return self.get_client(write=write)
+
+    def get_all_clients(self) -> list:
+        """Return a raw Redis client for every node holding cache keys."""
+        return [self.get_client(write=False)]
+
+    def get(self, key, *args, **kwargs):
+        token = _current_model.set(key_model(key))
+        try:
+            return super().get(key, *args, **kwargs)
+        finally:
+            _current_model.reset(token)
+
+    def set(self, key, value, *args, **kwargs):
+        token = _current_model.set(key_model(key))
+        try:
+            return super().set(key, value, *args, **kwargs)
+        finally:
+            _current_model.reset(token)
+
+    def encode(self, value: Any) -> Union[bytes, Any]:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        model = _current_model.get()
+        started = time.perf_counter()
+        serialized = self._serializer.dumps(value)
+        stored = self._compressor.compress(serialized)
+        cached_value_encode_seconds.labels(model=model).observe(
+            time.perf_counter() - started
+        )
+        cached_value_serialized_bytes.labels(model=model).observe(len(serialized))
+        cached_value_stored_bytes.labels(model=model).observe(len(stored))
+        return stored
+
+    def decode(self, value: Union[bytes, int]) -> Any:
+        started = time.perf_counter()
+        decoded = super().decode(value)
+        if not isinstance(decoded, int) or isinstance(decoded, bool):
+            cached_value_decode_seconds.labels(model=_current_model.get()).observe(
+                time.perf_counter() - started
+            )
+        return decoded
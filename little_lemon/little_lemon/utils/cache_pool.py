@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from typing import Optional
+
+from loguru import logger
+from prometheus_client import Counter, Gauge, Histogram
+from redis import BlockingConnectionPool
+from redis.exceptions import ConnectionError
+
+WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+cached_queryset_pool_checkout_seconds = Histogram(
+    "cached_queryset_pool_checkout_seconds",
+    "Time spent checking a connection out of the Redis connection pool",
+    ["worker", "node"],
+    buckets=WAIT_BUCKETS,
+)
+cached_queryset_pool_in_use = Gauge(
+    "cached_queryset_pool_in_use",
+    "Number of Redis connections currently checked out of the pool",
+    ["worker", "node"],
+)
+cached_queryset_pool_max_connections = Gauge(
+    "cached_queryset_pool_max_connections",
+    "Size of the Redis connection pool",
+    ["worker", "node"],
+)
+cached_queryset_pool_exhausted = Counter(
+    "cached_queryset_pool_exhausted",
+    "Number of checkouts that found no free Redis connection before the pool timeout",
+    ["worker", "node"],
+)
+
+
+def pool_size_for_threads(threads: int) -> int:
+    """Return the connection pool size a worker running `threads` threads needs.
+
+    A thread holds at most one connection at a time, since redis-py checks a connection
+    out per command. The invalidation listener holds one more for its subscription, and
+    one is kept spare for the rebuild locks and budget scripts running alongside.
+
+    Args:
+        threads (int): Number of request threads per worker.
+
+    Returns:
+        int: The number of connections.
+    """
+    return max(threads, 1) + 2
+
+
+class InstrumentedBlockingConnectionPool(BlockingConnectionPool):
+    """Blocking Redis connection pool that reports checkout waits and connections in use.
+
+    Checkouts slower than `wait_warning_threshold` seconds are logged, so an undersized pool
+    shows up as a warning instead of unexplained latency. Metrics are labelled with the
+    worker's pid and the pool's node, since every gunicorn worker has its own pools.
+    """
+
+    def __init__(self, *args, wait_warning_threshold: Optional[float] = None, **kwargs):
+        self.wait_warning_threshold = wait_warning_threshold
+        self.node = (
+            f"{kwargs.get('host', 'localhost')}:{kwargs.get('port', 6379)}"
+            f"/{kwargs.get('db', 0)}"
+        )
+        self._in_use = 0
+        self._in_use_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def _labels(self) -> dict:
+        return {"worker": str(os.getpid()), "node": self.node}
+
+    def reset(self) -> None:
+        super().reset()
+        # Also runs in a forked worker, whose connections were never checked out here
+        self._in_use = 0
+        cached_queryset_pool_in_use.labels(**self._labels()).set(0)
+        cached_queryset_pool_max_connections.labels(**self._labels()).set(
+            self.max_connections
+        )
+
+    def get_connection(self, command_name=None, *keys, **options):
+        started = time.perf_counter()
+        try:
+            connection = super().get_connection(command_name, *keys, **options)
+        except ConnectionError as e:
+            if str(e) == "No connection available.":
+                cached_queryset_pool_exhausted.labels(**self._labels()).inc()
+                logger.warning(
+                    f"Redis connection pool for {self.node} exhausted after {self.timeout}s "
+                    f"({self.max_connections} connections)"
+                )
+            raise
+        waited = time.perf_counter() - started
+        cached_queryset_pool_checkout_seconds.labels(**self._labels()).observe(waited)
+        with self._in_use_lock:
+            self._in_use += 1
+            cached_queryset_pool_in_use.labels(**self._labels()).set(self._in_use)
+        if (
+            self.wait_warning_threshold is not None
+            and waited > self.wait_warning_threshold
+        ):
+            logger.warning(
+                f"Waited {waited * 1000:.1f}ms for a Redis connection to {self.node}, "
+                f"{self._in_use}/{self.max_connections} in use"
+            )
+        return connection
+
+    def release(self, connection) -> None:
+        super().release(connection)
+        with self._in_use_lock:
+            self._in_use = max(self._in_use - 1, 0)
+            cached_queryset_pool_in_use.labels(**self._labels()).set(self._in_use)
@@ -0,0 +1,201 @@
+import bisect
+import hashlib
+from collections import defaultdict
+from typing import Any, Iterable, Optional
+from urllib.parse import urlsplit
+
+from django_redis.client import ShardClient
+from django_redis.client.default import DEFAULT_TIMEOUT
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import ConnectionError, ResponseError, TimeoutError
+
+from little_lemon.utils.cache_codec import (InstrumentedClient, _current_model,
+                                            key_model)
+
+# Errors django-redis reports as ConnectionInterrupted
+SHARD_ERRORS = (ConnectionError, ResponseError, TimeoutError)
+
+
+def hash_tag(namespace: str) -> str:
+    """Wrap a namespace in a hash tag, so every key starting with it lands on one shard.
+
+    Args:
+        namespace (str): The cache namespace, e.g. "MenuItem:MenuItemsListView".
+
+    Returns:
+        str: The tagged namespace, e.g. "{MenuItem:MenuItemsListView}".
+    """
+    return f"{{{namespace}}}"
+
+
+def routing_key(key: str) -> str:
+    """Return the part of a key that decides its shard, following Redis Cluster hash tags.
+
+    If the key contains a non-empty `{...}` section, only the first such section is
+    hashed. Otherwise the whole key is.
+
+    Args:
+        key (str): The full Redis key.
+
+    Returns:
+        str: The hash tag, or the key itself.
+    """
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1 : end]
+    return key
+
+
+def shard_node_name(url: str) -> str:
+    """Return the stable name of a shard on the ring, e.g. "cache-1:6379/0".
+
+    Credentials and options are left out, so rotating a password does not move keys.
+
+    Args:
+        url (str): The shard's connection URL.
+
+    Returns:
+        str: The host, port and database of the shard.
+    """
+    parts = urlsplit(url)
+    database = parts.path.lstrip("/") or "0"
+    return f"{parts.hostname}:{parts.port or 6379}/{database}"
+
+
+class HashRing:
+    """Consistent hash ring mapping keys to shards.
+
+    Each shard is placed on the ring `replicas` times, and a key belongs to the first shard
+    point at or after its own hash. Adding a shard only moves the keys falling on its new
+    points, about 1/N of them, and removing one only moves the keys it held.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 160):
+        self.replicas = replicas
+        self.nodes: list[str] = []
+        self._points: list[int] = []
+        self._owners: dict[int, str] = {}
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+    def add_node(self, node: str) -> None:
+        """Place a shard on the ring.
+
+        Args:
+            node (str): The shard's name.
+        """
+        self.nodes.append(node)
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}#{replica}")
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def remove_node(self, node: str) -> None:
+        """Take a shard off the ring.
+
+        Args:
+            node (str): The shard's name.
+        """
+        self.nodes.remove(node)
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}#{replica}")
+            del self._owners[point]
+            self._points.remove(point)
+
+    def get_node(self, key: str) -> str:
+        """Return the shard a key belongs to.
+
+        Args:
+            key (str): The routing key, see `routing_key`.
+
+        Returns:
+            str: The shard's name.
+
+        Raises:
+            ValueError: If the ring has no shards.
+        """
+        if not self._points:
+            raise ValueError("The hash ring has no nodes")
+        index = bisect.bisect_left(self._points, self._hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+class ShardedClient(InstrumentedClient, ShardClient):
+    """django-redis client spreading keys over several Redis or Dragonfly nodes.
+
+    `LOCATION` lists one URL per shard. Keys are placed on a consistent hash ring keyed by
+    their hash tag, so the entries, generation counters and budget indexes of a cache
+    namespace (see `hash_tag`) all live on the same shard, and Lua scripts and pipelines
+    over them stay on a single node. Multi-key reads and writes are sent as one MGET or
+    pipeline per shard.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._ring = HashRing(
+            self._serverdict, replicas=self._options.get("SHARD_REPLICAS", 160)
+        )
+
+    def connect(self, index=0):
+        return {
+            shard_node_name(url): self.connection_factory.connect(url)
+            for url in self._server
+        }
+
+    def get_server_name(self, _key) -> str:
+        return self._ring.get_node(routing_key(str(_key)))
+
+    def get_client_for_key(self, key, write: bool = True):
+        return self.get_server(key)
+
+    def get_all_clients(self) -> list:
+        return list(self._serverdict.values())
+
+    def get_many(self, keys, version=None) -> dict:
+        keys_by_shard: dict[str, dict] = defaultdict(dict)
+        for key in keys:
+            made_key = self.make_key(key, version=version)
+            keys_by_shard[self.get_server_name(made_key)][made_key] = key
+        recovered_data = {}
+        for name, shard_keys in keys_by_shard.items():
+            client = self._serverdict[name]
+            try:
+                values = client.mget(list(shard_keys))
+            except SHARD_ERRORS as e:
+                raise ConnectionInterrupted(connection=client) from e
+            for made_key, value in zip(shard_keys, values):
+                if value is None:
+                    continue
+                key = shard_keys[made_key]
+                token = _current_model.set(key_model(key))
+                try:
+                    recovered_data[key] = self.decode(value)
+                finally:
+                    _current_model.reset(token)
+        return recovered_data
+
+    def set_many(self, data: dict, timeout=DEFAULT_TIMEOUT, version=None) -> None:
+        pipelines: dict[str, Any] = {}
+        for key, value in data.items():
+            name = self.get_server_name(self.make_key(key, version=version))
+            if name not in pipelines:
+                pipelines[name] = self._serverdict[name].pipeline(transaction=False)
+            self.set(key, value, timeout, version=version, client=pipelines[name])
+        for name, pipeline in pipelines.items():
+            try:
+                pipeline.execute()
+            except SHARD_ERRORS as e:
+                raise ConnectionInterrupted(connection=self._serverdict[name]) from e
+
+    def clear(self, client: Optional[Any] = None) -> None:
+        for connection in self._serverdict.values():
+            try:
+                connection.flushdb()
+            except SHARD_ERRORS as e:
+                raise ConnectionInterrupted(connection=connection) from e
@@ -0,0 +1,160 @@
+import random
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from loguru import logger
+from prometheus_client import Gauge
+from redis.exceptions import RedisError, ResponseError
+
+from little_lemon.utils.cache_shard import hash_tag
+
+cached_namespace_keys = Gauge(
+    "cached_queryset_namespace_keys",
+    "Number of Redis keys held by a cache namespace",
+    ["namespace"],
+)
+cached_namespace_bytes = Gauge(
+    "cached_queryset_namespace_bytes",
+    "Redis memory used by the keys of a cache namespace",
+    ["namespace"],
+)
+cached_namespace_hit_ratio = Gauge(
+    "cached_queryset_namespace_hit_ratio",
+    "Share of sampled reads of a cache namespace that were hits",
+    ["namespace"],
+)
+
+
+def hot_keys_key(namespace: str) -> str:
+    """Return the key of the sorted set counting sampled reads of a namespace's keys."""
+    return f"cache-stats:{hash_tag(namespace)}:hot"
+
+
+def reads_key(namespace: str) -> str:
+    """Return the key of the hash counting sampled hits and misses of a namespace."""
+    return f"cache-stats:{hash_tag(namespace)}:reads"
+
+
+def record_access(namespace: str, cache_key: str, hit: bool) -> None:
+    """Record a read of `cache_key` for a sample of `VIEW_CACHE_STATS_SAMPLE_RATE` of calls.
+
+    Sampled reads are counted per key in a sorted set, trimmed to the
+    `VIEW_CACHE_STATS_MAX_HOT_KEYS` most read keys, and as hits or misses per namespace.
+    Everything expires after `VIEW_CACHE_STATS_WINDOW` seconds without reads. Failures
+    are logged and never affect the request.
+
+    Args:
+        namespace (str): The namespace of the view that read the key.
+        cache_key (str): The cache key that was read.
+        hit (bool): Whether the read was served from the cache.
+    """
+    if random.random() >= settings.VIEW_CACHE_STATS_SAMPLE_RATE:
+        return
+    hot_key = cache.client.make_key(hot_keys_key(namespace))
+    counter_key = cache.client.make_key(reads_key(namespace))
+    try:
+        # Both keys carry the namespace's hash tag, so they share a shard
+        client = cache.client.get_client_for_key(hot_key)
+        pipeline = client.pipeline(transaction=False)
+        pipeline.zincrby(hot_key, 1, cache_key)
+        pipeline.zremrangebyrank(
+            hot_key, 0, -settings.VIEW_CACHE_STATS_MAX_HOT_KEYS - 1
+        )
+        pipeline.expire(hot_key, settings.VIEW_CACHE_STATS_WINDOW)
+        pipeline.hincrby(counter_key, "hits" if hit else "misses", 1)
+        pipeline.expire(counter_key, settings.VIEW_CACHE_STATS_WINDOW)
+        pipeline.execute()
+    except RedisError as e:
+        logger.warning(f"Unable to record cache access for {namespace}: {e}")
+
+
+def measure_keys(client, keys: list[bytes]) -> int:
+    """Return the memory used by `keys`, falling back to value sizes without MEMORY USAGE.
+
+    Args:
+        client: The Redis client to query.
+        keys (list[bytes]): The full Redis keys to measure.
+
+    Returns:
+        int: The total number of bytes.
+    """
+    pipeline = client.pipeline(transaction=False)
+    for key in keys:
+        pipeline.memory_usage(key)
+    try:
+        sizes = pipeline.execute()
+    except ResponseError:
+        pipeline = client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.strlen(key)
+        sizes = pipeline.execute()
+    return sum(size or 0 for size in sizes)
+
+
+def collect_namespace_stats(namespaces: Iterable[str], top_n: int = 10) -> list[dict]:
+    """Report the size, hit ratio and hottest keys of each namespace, and export them as gauges.
+
+    Key counts and sizes come from a SCAN of each namespace on every shard. Hit ratios and access
+    counts are estimated from the sampled reads, scaled back up by the sample rate.
+
+    Args:
+        namespaces (Iterable[str]): The cache namespaces to report on.
+        top_n (int, optional): Number of hot keys to report per namespace, at most
+            `VIEW_CACHE_STATS_MAX_TOP`.
+
+    Raises:
+        ValueError: If `top_n` is not positive.
+
+    Returns:
+        list[dict]: One report per namespace, largest first.
+    """
+    if top_n < 1:
+        # ZREVRANGE 0 -1 would return every tracked key
+        raise ValueError(f"top_n must be positive, not {top_n}")
+    top_n = min(top_n, settings.VIEW_CACHE_STATS_MAX_TOP)
+    sample_rate = settings.VIEW_CACHE_STATS_SAMPLE_RATE
+    reports = []
+    for namespace in namespaces:
+        match = f"{cache.client.make_key(hash_tag(namespace))}:*"
+        keys = []
+        total_bytes = 0
+        for node_client in cache.client.get_all_clients():
+            node_keys = list(node_client.scan_iter(match=match, count=1000))
+            if node_keys:
+                keys.extend(node_keys)
+                total_bytes += measure_keys(node_client, node_keys)
+        counter_key = cache.client.make_key(reads_key(namespace))
+        client = cache.client.get_client_for_key(counter_key, write=False)
+        counts = client.hgetall(counter_key)
+        namespace_hits = int(counts.get(b"hits", 0))
+        namespace_misses = int(counts.get(b"misses", 0))
+        reads = namespace_hits + namespace_misses
+        hit_ratio = namespace_hits / reads if reads else None
+        hot_keys = client.zrevrange(
+            cache.client.make_key(hot_keys_key(namespace)),
+            0,
+            top_n - 1,
+            withscores=True,
+        )
+        reports.append(
+            {
+                "namespace": namespace,
+                "keys": len(keys),
+                "bytes": total_bytes,
+                "hit_ratio": hit_ratio,
+                "estimated_reads": round(reads / sample_rate) if sample_rate else 0,
+                "hot_keys": [
+                    {
+                        "key": key.decode("utf-8"),
+                        "estimated_reads": round(score / sample_rate),
+                    }
+                    for key, score in hot_keys
+                ],
+            }
+        )
+        cached_namespace_keys.labels(namespace=namespace).set(len(keys))
+        cached_namespace_bytes.labels(namespace=namespace).set(total_bytes)
+        if hit_ratio is not None:
+            cached_namespace_hit_ratio.labels(namespace=namespace).set(hit_ratio)
+    return sorted(reports, key=lambda report: report["bytes"], reverse=True)
@@ -0,0 +1,70 @@
+import gzip
+from typing import Optional
+
+from loguru import logger
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional, gzip is always available
+    zstandard = None
+
+SUPPORTED_ENCODINGS = ("zstd", "gzip") if zstandard else ("gzip",)
+
+
+def resolve_encoding(encoding: Optional[str]) -> Optional[str]:
+    """Return the configured encoding if this interpreter can produce it.
+
+    Args:
+        encoding (str or None): "zstd", "gzip" or None to disable compression.
+
+    Returns:
+        str or None: The encoding to use, falling back to gzip when zstd is unavailable.
+    """
+    if encoding and encoding not in SUPPORTED_ENCODINGS:
+        logger.warning(f"{encoding} compression is unavailable, falling back to gzip")
+        return "gzip"
+    return encoding or None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    """Compress `body` with the given content encoding.
+
+    Args:
+        body (bytes): The uncompressed bytes.
+        encoding (str or None): "zstd", "gzip" or None to leave the body as is.
+
+    Returns:
+        bytes: The encoded bytes.
+    """
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+def decompress(body: bytes, encoding: Optional[str]) -> bytes:
+    """Reverse `compress`.
+
+    Args:
+        body (bytes): The encoded bytes.
+        encoding (str or None): The encoding `body` was produced with.
+
+    Returns:
+        bytes: The uncompressed bytes.
+    """
+    if encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompress(body)
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    return body
+
+
+def accepts_encoding(request, encoding: str) -> bool:
+    """Return whether the client advertised `encoding` in its Accept-Encoding header."""
+    accepted = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    return any(
+        part.split(";")[0].strip().lower() == encoding
+        and not part.replace(" ", "").endswith(";q=0")
+        for part in accepted.split(",")
+    )
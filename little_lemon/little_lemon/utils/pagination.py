@@ -0,0 +1,223 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """Limit/offset pagination with an opt-in keyset (cursor) mode.
+
+    A view opts in by declaring `keyset_ordering`, a tuple of model fields whose values
+    identify a row and that an index covers in that order. A request then opts in by sending
+    `cursor` (empty for the first page). Keyset pages are read with
+    `WHERE (ordering) > (last row) ORDER BY ordering LIMIT limit + 1`, so a page costs the
+    same at any depth and no `COUNT(*)` is run. Requests without `cursor`, and views without
+    `keyset_ordering`, keep the limit/offset behaviour and envelope.
+
+    The cursor is the position of the last row of the previous page, so rows inserted or
+    deleted while a client pages through the list neither repeat nor skip rows.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def is_keyset_request(self, request, view=None) -> bool:
+        """Return whether the request asked for keyset pagination and the view supports it.
+
+        Args:
+            request: The request being paginated.
+            view: The view serving it.
+
+        Returns:
+            bool: True if the page should be read by keyset.
+        """
+        return (
+            bool(self.get_position_fields(view))
+            and self.cursor_query_param in request.query_params
+        )
+
+    def get_position_fields(self, view) -> Sequence[str]:
+        """Return the fields of the view's keyset ordering, without direction prefixes.
+
+        Args:
+            view: The paginated view.
+
+        Returns:
+            Sequence[str]: The field names, empty if the view has no keyset ordering.
+        """
+        return [field.lstrip("-") for field in getattr(view, "keyset_ordering", ())]
+
+    def get_position(self, request, model: type[Model]) -> Optional[list]:
+        """Decode the position carried by the request's cursor.
+
+        Each value is converted by its model field, so a tampered cursor is rejected here
+        instead of failing in the query.
+
+        Args:
+            request: The request being paginated.
+            model (type[Model]): The paginated model.
+
+        Raises:
+            NotFound: If the cursor is not one this paginator produced.
+
+        Returns:
+            list or None: The ordering values of the last row of the previous page, or None
+            for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param, "")
+        if not encoded:
+            return None
+        try:
+            position = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        # The keyset comparison cannot be made against NULL
+        if any(value is None for value in position):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_position(self, position: Sequence) -> str:
+        """Encode a row position as an opaque cursor.
+
+        Args:
+            position (Sequence): The ordering values of a row.
+
+        Returns:
+            str: The URL-safe cursor.
+        """
+        return urlsafe_b64encode(
+            json.dumps(list(position), cls=DjangoJSONEncoder).encode("utf-8")
+        ).decode("ascii")
+
+    def get_canonical_cursor(self, request, view) -> str:
+        """Return the request's cursor re-encoded, so equivalent cursors share a cache key.
+
+        Args:
+            request: The request being paginated.
+            view: The view serving it.
+
+        Returns:
+            str: The canonical cursor, empty for the first page.
+        """
+        self.ordering = tuple(view.keyset_ordering)
+        position = self.get_position(request, view.get_queryset().model)
+        return "" if position is None else self.encode_position(position)
+
+    def after_position(self, position: Sequence) -> Q:
+        """Build the filter for the rows that sort after `position`.
+
+        The row comparison is spelled out as (a > x) OR (a = x AND b > y) OR ..., which every
+        backend supports, and ANDed with a >= x so the leading index column bounds the scan.
+
+        Args:
+            position (Sequence): The ordering values of the last row of the previous page.
+
+        Returns:
+            Q: The filter.
+        """
+        after = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            after |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        first = self.ordering[0]
+        bound = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{bound}": position[0]}) & after
+
+    def position_of(self, item) -> list:
+        """Read the ordering values of a paginated item.
+
+        Args:
+            item (Model or dict): A model instance or a `.values()` row that includes the
+                ordering fields.
+
+        Returns:
+            list: The item's position.
+        """
+        fields = [field.lstrip("-") for field in self.ordering]
+        if isinstance(item, dict):
+            return [item[field] for field in fields]
+        return [item.serializable_value(field) for field in fields]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_keyset_request(request, view):
+            self.keyset = False
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset = True
+        self.request = request
+        self.ordering = tuple(view.keyset_ordering)
+        self.limit = self.get_limit(request)
+        position = self.get_position(request, queryset.model)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after_position(position))
+        # One row past the page tells whether there is a next page, without a COUNT
+        rows = list(queryset[: self.limit + 1])
+        page = rows[: self.limit]
+        self.next_position = (
+            self.position_of(page[-1]) if len(rows) > self.limit else None
+        )
+        return page
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_position(self.next_position)
+        )
+
+    def get_paginated_response(self, data) -> Response:
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"][
+            "description"
+        ] = "Left out of keyset (cursor) pages."
+        return response_schema
+
+    def get_schema_operation_parameters(self, view) -> list:
+        parameters = super().get_schema_operation_parameters(view)
+        if self.get_position_fields(view):
+            parameters.append(
+                {
+                    "name": self.cursor_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": "Keyset pagination cursor, empty for the first page. "
+                    "Replaces offset and leaves out the total count.",
+                    "schema": {"type": "string"},
+                }
+            )
+        return parameters
@@ -0,0 +1,232 @@
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Iterable, Optional
+
+from django.db.models import Model
+from loguru import logger
+
+from little_lemon.utils.cache import (ensure_invalidation_listener,
+                                      invalidation_handlers,
+                                      published_row_models)
+
+_WORDS = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Fold case and collapse whitespace and punctuation, so "  Pizza-Bianca" is "pizza bianca"."""
+    return " ".join(_WORDS.findall(text.casefold()))
+
+
+class PrefixIndex:
+    """Thread-safe, in-process index answering "which titles have a word starting with ...".
+
+    Each title is stored once per word, under the title's remainder from that word on, in a
+    sorted array. A lookup bisects to the first key starting with the prefix and walks the
+    array from there, so its cost depends on the number of matching titles, not of titles.
+    """
+
+    def __init__(self):
+        # (key, kind, pk) tuples, sorted
+        self._keys: list[tuple[str, str, object]] = []
+        # (kind, pk) -> (title, keys it is stored under)
+        self._entries: dict[tuple[str, object], tuple[str, list[str]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, kind: str, pk) -> None:
+        title_and_keys = self._entries.pop((kind, pk), None)
+        if title_and_keys is None:
+            return
+        for key in title_and_keys[1]:
+            index = bisect_left(self._keys, (key, kind, pk))
+            if index < len(self._keys) and self._keys[index] == (key, kind, pk):
+                del self._keys[index]
+
+    def _add(self, kind: str, pk, title: str) -> None:
+        words = normalize(title).split(" ")
+        keys = [" ".join(words[index:]) for index in range(len(words)) if words[index]]
+        self._entries[(kind, pk)] = (title, keys)
+        for key in keys:
+            insort(self._keys, (key, kind, pk))
+
+    def upsert(self, kind: str, pk, title: str) -> None:
+        """Index `title` for the entry `kind`/`pk`, replacing its previous title.
+
+        Args:
+            kind (str): What the entry is, e.g. "item".
+            pk: The entry's primary key.
+            title (str): The title to index.
+        """
+        with self._lock:
+            self._remove(kind, pk)
+            self._add(kind, pk, title)
+
+    def remove(self, kind: str, pk) -> None:
+        """Drop the entry `kind`/`pk`, if it is indexed.
+
+        Args:
+            kind (str): What the entry is.
+            pk: The entry's primary key.
+        """
+        with self._lock:
+            self._remove(kind, pk)
+
+    def replace(self, entries: Iterable[tuple[str, object, str]]) -> None:
+        """Replace the whole index with `entries`.
+
+        Args:
+            entries (Iterable[tuple]): (kind, pk, title) tuples.
+        """
+        index = PrefixIndex()
+        for kind, pk, title in entries:
+            index._add(kind, pk, title)
+        with self._lock:
+            self._keys, self._entries = index._keys, index._entries
+
+    def search(self, prefix: str, limit: int) -> list[dict]:
+        """Return up to `limit` entries with a word starting with `prefix`.
+
+        Titles starting with the prefix come first, then titles with a later word starting
+        with it, each in alphabetical order.
+
+        Args:
+            prefix (str): What the user typed so far.
+            limit (int): The maximum number of entries returned.
+
+        Returns:
+            list[dict]: The matching entries, as {"type", "id", "title"}.
+        """
+        prefix = normalize(prefix)
+        if not prefix or limit < 1:
+            return []
+        title_matches = {}
+        word_matches = {}
+        with self._lock:
+            index = bisect_left(self._keys, (prefix,))
+            # Title matches are met in alphabetical order, so the walk can stop at `limit` of
+            # them. Word matches are met in the order of the matching word, so all are kept.
+            while index < len(self._keys) and len(title_matches) < limit:
+                key, kind, pk = self._keys[index]
+                if not key.startswith(prefix):
+                    break
+                title, keys = self._entries[(kind, pk)]
+                matches = title_matches if key == keys[0] else word_matches
+                matches[(kind, pk)] = (keys[0], title)
+                index += 1
+        ranked = list(title_matches.items())
+        ranked.extend(
+            heapq.nsmallest(
+                limit - len(ranked),
+                (
+                    match
+                    for match in word_matches.items()
+                    if match[0] not in title_matches
+                ),
+                key=lambda match: match[1],
+            )
+        )
+        return [
+            {"type": kind, "id": pk, "title": title}
+            for (kind, pk), (_, title) in ranked
+        ]
+
+
+class ModelPrefixIndex(PrefixIndex):
+    """Prefix index over a title field of several models, kept in step with their rows.
+
+    The index is loaded on first use, then updated row by row. The indexed models are added
+    to the cache's `published_row_models`, so the cache's save and delete receivers queue the
+    row namespace of every changed row. When the transaction commits, the saving worker
+    reloads those rows in place, and every other worker does the same when the namespaces
+    reach it through the invalidation channel, in its listener thread. Lookups never touch
+    the database. The whole index is reloaded once it is `ttl` seconds old, which bounds how
+    long a worker can serve a title after missing a message, and whenever the listener may
+    have missed messages.
+
+    Args:
+        sources (dict[str, tuple[type[Model], str]]): Maps each entry kind to the model and
+            title field it is read from, e.g. {"item": (MenuItem, "title")}.
+        ttl (float): Seconds after which the index is reloaded from the database.
+    """
+
+    def __init__(self, sources: dict[str, tuple[type[Model], str]], ttl: float):
+        super().__init__()
+        self.sources = sources
+        self.ttl = ttl
+        self._loaded_at: Optional[float] = None
+        self._load_lock = threading.Lock()
+
+    def _fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    def ensure_loaded(self) -> None:
+        """Load the index from the database, unless a fresh copy is already loaded."""
+        if self._fresh():
+            return
+        with self._load_lock:
+            if self._fresh():
+                return
+            # Without the listener, saves in other workers wait for the ttl reload
+            ensure_invalidation_listener()
+            loaded_at = time.monotonic()
+            self.replace(
+                (kind, pk, title)
+                for kind, (model, field) in self.sources.items()
+                for pk, title in model.objects.order_by().values_list("pk", field)
+            )
+            self._loaded_at = loaded_at
+            logger.debug(f"Prefix index loaded with {len(self)} titles")
+
+    def expire(self) -> None:
+        """Reload the whole index on next use."""
+        self._loaded_at = None
+
+    def search(self, prefix: str, limit: int) -> list[dict]:
+        self.ensure_loaded()
+        return super().search(prefix, limit)
+
+    def connect(self) -> None:
+        """Follow saves and deletes of the indexed models, here and in other workers.
+
+        This must run before the cache dependency registry is built.
+        """
+        for model, _ in self.sources.values():
+            published_row_models.add(model)
+        if self.handle_invalidation not in invalidation_handlers:
+            invalidation_handlers.append(self.handle_invalidation)
+
+    def handle_invalidation(self, namespaces: Optional[list[str]]) -> None:
+        """Reload the rows named by an invalidation message.
+
+        Args:
+            namespaces (list[str] or None): The message's namespaces, or None if messages
+                may have been missed.
+        """
+        if namespaces is None:
+            self.expire()
+            return
+        if self._loaded_at is None:
+            return
+        for kind, (model, field) in self.sources.items():
+            prefix = f"{model.__name__}:pk:"
+            pks = {
+                model._meta.pk.to_python(namespace[len(prefix) :])
+                for namespace in namespaces
+                if namespace.startswith(prefix)
+            }
+            if not pks:
+                continue
+            titles = dict(model.objects.filter(pk__in=pks).values_list("pk", field))
+            for pk in pks:
+                if pk in titles:
+                    self.upsert(kind, pk, titles[pk])
+                else:
+                    self.remove(kind, pk)
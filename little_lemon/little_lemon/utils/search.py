@@ -0,0 +1,72 @@
+from functools import reduce
+from operator import and_
+from typing import List
+
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            TrigramWordSimilarity)
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+from rest_framework.filters import SearchFilter
+
+
+class FullTextSearchFilter(SearchFilter):
+    """Search filter backed by a Postgres `tsvector` column and `pg_trgm`.
+
+    DRF's `SearchFilter` turns every term into `ILIKE '%term%'`, which no btree index can
+    serve. This backend matches a row when any of these holds, each served by a GIN index:
+
+    - its search vector matches the terms, stemmed (`@@` on `search_vector_field`),
+    - the terms are trigram-similar to a word of its `search_trigram_field` (`%>`), which
+      tolerates typos,
+    - its `search_trigram_field` contains every term, as `SearchFilter` did, so substring
+      matches keep working (a `gin_trgm_ops` index also serves `ILIKE '%term%'`).
+
+    Matches are ordered by full-text rank, then trigram similarity. The view declares
+    `search_vector_field`, `search_trigram_field` and optionally `search_config`; its
+    `search_fields` keep driving the schema and the canonical cache key. On other databases
+    the backend falls back to `SearchFilter`.
+    """
+
+    search_config = "english"
+
+    def filter_queryset(self, request, queryset: QuerySet, view) -> QuerySet:
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        if connections[queryset.db].vendor != "postgresql":
+            return super().filter_queryset(request, queryset, view)
+        return self.search(queryset, terms, view)
+
+    def search(self, queryset: QuerySet, terms: List[str], view) -> QuerySet:
+        """Filter `queryset` to the rows matching `terms`, most relevant first.
+
+        Args:
+            queryset (QuerySet): The queryset to search.
+            terms (List[str]): The search terms.
+            view: The view declaring the search fields.
+
+        Returns:
+            QuerySet: The matching rows, annotated with `search_rank` and
+            `search_similarity`.
+        """
+        vector_field = view.search_vector_field
+        trigram_field = view.search_trigram_field
+        text = " ".join(terms)
+        query = SearchQuery(
+            text, config=getattr(view, "search_config", self.search_config)
+        )
+        contains = reduce(
+            and_, (Q(**{f"{trigram_field}__icontains": term}) for term in terms)
+        )
+        return (
+            queryset.annotate(
+                search_rank=SearchRank(F(vector_field), query),
+                search_similarity=TrigramWordSimilarity(text, trigram_field),
+            )
+            .filter(
+                Q(**{vector_field: query})
+                | Q(**{f"{trigram_field}__trigram_word_similar": text})
+                | contains
+            )
+            .order_by("-search_rank", "-search_similarity", "pk")
+        )
@@ -5,9 +5,9 @@ from invoke.watchers import FailingResponder, Responder
 
 
 @task()
-def start(ctx, port, workers, threads, log_level="INFO"):
+def start(ctx, port, workers, threads, log_level="INFO", warm_cache=False):
     ctx.run(
-        f"doppler run -- gunicorn --workers {workers} --threads {threads} --log-level {log_level}  --env DJANGO_SETTINGS_MODULE=little_lemon.settings little_lemon.wsgi  -b :{port} "
+        f"doppler run -- gunicorn --workers {workers} --threads {threads} --log-level {log_level}  --env DJANGO_SETTINGS_MODULE=little_lemon.settings --env WARM_CACHE_ON_START={warm_cache} little_lemon.wsgi  -b :{port} "
     )
 
 
@@ -41,6 +41,13 @@ def sync(ctx, dry_run=False):
     ctx.run("pip freeze > ../requirements.txt")
 
 
+@task
+def warm_cache(ctx, pages=3, concurrency=4):
+    ctx.run(
+        f"doppler run -- python manage.py warm_cache --pages {pages} --concurrency {concurrency}"
+    )
+
+
 @task
 def uncache(ctx):
     ctx.run("doppler run -- python manage.py invalidate_cachalot")